@@ -0,0 +1,141 @@
+"""Compara a visita sequencial e a concorrente das páginas de semana.
+
+Sobe um servidor HTTP local que imita as páginas do wol.jw.org (com uma
+latência artificial por requisição) e mede a busca das semanas com
+diferentes valores de `concurrency`:
+
+    http     `DataScrapper._fetch_weeks` pelo HTTP, sem cache; a
+             concorrência fica fixa (sem o ajuste do scheduler)
+    browser  `DataScrapper._browser_fetch_weeks` em abas do Chromium
+             (precisa de `playwright install chromium`)
+
+A primeira concorrência da lista é a linha de base do speedup.
+
+    python benchmarks/concurrent_fetch.py --weeks 52 --latency 0.3
+    python benchmarks/concurrent_fetch.py --modes http browser --concurrency 1 4 8
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapper.web_scrapper import DataScrapper
+
+
+WEEK_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Semana {n}</title></head>
+<body><article id="article">
+<h1>{n}-{m} DE MARZO</h1>
+<h2>ISAÍAS {n}</h2>
+<h3>Canción {n} y oración</h3>
+<h2>TESOROS DE LA BIBLIA</h2>
+<h3>1. Lectura de la Biblia (4 mins.)</h3>
+<h2>SEAMOS MEJORES MAESTROS</h2>
+<h3>2. Empiece conversaciones (3 mins.)</h3>
+<h2>NUESTRA VIDA CRISTIANA</h2>
+<h3>3. Estudio bíblico de la congregación (30 mins.)</h3>
+<h3>Palabras de conclusión (3 mins.)</h3>
+</article></body></html>
+"""
+
+
+def start_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            n = int(self.path.rsplit("/", 1)[-1] or 1)
+            body = WEEK_HTML.format(n=n, m=n + 6).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def expected(weeks):
+    return [f"{n}-{n + 6} DE MARZO" for n in range(1, weeks + 1)]
+
+
+def run_http(urls, levels):
+    tempos = {}
+    for concurrency in levels:
+        scrapper = DataScrapper(concurrency=concurrency, max_concurrency=concurrency)
+        # Sem cache: toda rodada paga a latência de cada página
+        scrapper.http.cache = None
+
+        inicio = time.perf_counter()
+        data = scrapper._fetch_weeks(urls)
+        tempos[concurrency] = time.perf_counter() - inicio
+        scrapper.close()
+
+        assert [d[0] for d in data] == expected(len(urls))
+    return tempos
+
+
+def run_browser(urls, levels):
+    from playwright.sync_api import sync_playwright
+
+    tempos = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+
+        for concurrency in levels:
+            scrapper = DataScrapper(concurrency=concurrency)
+            page = context.new_page()
+
+            inicio = time.perf_counter()
+            data = scrapper._browser_fetch_weeks(page, urls)
+            tempos[concurrency] = time.perf_counter() - inicio
+            scrapper.close()
+
+            assert [d[0] for d in data] == expected(len(urls))
+            page.close()
+
+        browser.close()
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--modes", nargs="+", choices=["http", "browser"], default=["http"])
+    args = parser.parse_args()
+
+    server = start_server(args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}/semana/"
+    urls = [f"{base}{n}" for n in range(1, args.weeks + 1)]
+
+    print(f"{args.weeks} semanas, latência {args.latency:.2f}s por página")
+    for mode in args.modes:
+        runner = run_http if mode == "http" else run_browser
+        try:
+            tempos = runner(urls, args.concurrency)
+        except Exception as e:
+            print(f"  {mode}: não rodou ({e.__class__.__name__}: {str(e).splitlines()[0]})")
+            continue
+
+        base_time = tempos[args.concurrency[0]]
+        for concurrency, elapsed in tempos.items():
+            print(
+                f"  {mode:<7} concurrency={concurrency:<3} {elapsed:7.2f}s  "
+                f"speedup x{base_time / elapsed:.2f}"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
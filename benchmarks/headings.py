@@ -0,0 +1,237 @@
+"""Compara a extração de títulos com BeautifulSoup e com o HeadingParser.
+
+Monta uma página com o mesmo peso de uma página de semana do wol.jw.org
+(menus, scripts inline, artigo com parágrafos) e mede, por página, o tempo
+de parse e o pico de memória de cada caminho. Os dois precisam devolver
+exatamente as mesmas listas.
+
+Antes de medir, confere a paridade sobre as páginas de benchmarks/fixtures,
+também numa cópia com os títulos quebrados e indentados em várias linhas.
+A referência é o resultado de antes, `h.text.strip()` do BeautifulSoup; o
+`extract_headings` e uma cópia em Python do HEADINGS_JS (os nós de texto
+crus, com a mesma regra para os nós só de espaços) precisam devolver
+exatamente o mesmo. Com `--browser`, as páginas também são abertas no
+Chromium e `page_headings` entra na comparação.
+
+    python benchmarks/headings.py --runs 50
+    python benchmarks/headings.py --browser
+"""
+from html.parser import HTMLParser
+import argparse
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from scrapper.headings import (
+    HEADING_TAGS, IGNORED_TEXT_TAGS, PRESERVE_WHITESPACE_TAGS, VOID_TAGS,
+    extract_headings, page_headings,
+)
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HEADING_RE = re.compile(r"(<h([123])\b[^>]*>)(.*?)(</h\2>)", re.S)
+
+
+def build_page(week: int = 3) -> str:
+    nav = "".join(
+        f'<li class="row card"><a class="cardContainer" href="/es/wol/d/r4/lp-s/{i}">'
+        f'<div class="cardLine1">Publicación {i}</div><div class="cardLine2">Detalle</div></a></li>'
+        for i in range(400)
+    )
+    script = "<script>window.dataLayer = [" + ",".join(f'{{"k{i}": {i}}}' for i in range(800)) + "];</script>"
+    paragraphs = "".join(
+        f'<p id="p{i}" data-pid="{i}" class="sb">Texto del párrafo {i} con <a href="/x/{i}">referencias</a> '
+        f"&amp; notas&nbsp;bíblicas <strong>destacadas</strong>.</p>"
+        for i in range(300)
+    )
+    article = f"""
+        <h1 id="p1">{week}-{week + 6} DE MARZO</h1>
+        <h2 id="p2"><a href="/b">ISAÍAS 1, 2</a></h2>
+        <h3 class="dc-icon--music">Canción 1 y oración | Palabras de introducción (1 min.)</h3>
+        <h2 class="du-color--teal-700">TESOROS DE LA BIBLIA</h2>
+        <h3>1. «Vengan, pongamos las cosas en orden» (10 mins.)</h3>{paragraphs}
+        <h3>2. Busquemos perlas escondidas (10 mins.)</h3>
+        <h3>3. Lectura de la Biblia (4 mins.)</h3>
+        <h2 class="du-color--gold-700">SEAMOS MEJORES MAESTROS</h2>
+        <h3>4. Empiece conversaciones (3 mins.)</h3>
+        <h3>5. Haga revisitas (4 mins.)</h3>
+        <h2 class="du-color--maroon-600">NUESTRA VIDA CRISTIANA</h2>
+        <h3>6. Necesidades de la congregación (15 mins.)</h3>
+        <h3>7. Estudio bíblico de la congregación (30 mins.)</h3>
+        <h3>Palabras de conclusión (3 mins.) | Canción 2 y oración</h3>
+    """
+    return (
+        '<!DOCTYPE html><html lang="es"><head><meta charset="utf-8"><title>Guía</title>'
+        f'<link rel="stylesheet" href="/a.css">{script}</head><body>'
+        f'<header><h3 class="visuallyHidden">Configuración de privacidad</h3></header>'
+        f'<div id="materialNav"><nav><ul class="directory navCard">{nav}</ul></nav></div>'
+        f'<article id="article">{article}</article>{script}</body></html>'
+    )
+
+
+def bs4_headings(html: str) -> list[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    return [h.text.strip() for h in soup.find_all(["h1", "h2", "h3"])]
+
+
+class DomText(HTMLParser):
+    """O HEADINGS_JS em Python: junta os nós de texto crus de cada título."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headings = []
+        self._stack = []
+        # (profundidade, trechos) dos títulos abertos
+        self._open = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        self._stack.append(tag)
+        if tag in HEADING_TAGS:
+            self._open.append((len(self._stack) - 1, []))
+            self.headings.append(self._open[-1][1])
+
+    def handle_endtag(self, tag):
+        if tag in self._stack:
+            position = len(self._stack) - 1 - self._stack[::-1].index(tag)
+            del self._stack[position:]
+            self._open = [(depth, chunks) for depth, chunks in self._open if depth < position]
+
+    def handle_data(self, data):
+        if any(tag in IGNORED_TEXT_TAGS for tag in self._stack):
+            return
+        if not data.strip(" \n\t\f\r") and not any(
+            tag in PRESERVE_WHITESPACE_TAGS for tag in self._stack
+        ):
+            data = "\n" if "\n" in data else " "
+        for _, chunks in self._open:
+            chunks.append(data)
+
+
+def dom_headings(html: str) -> list[str]:
+    parser = DomText()
+    parser.feed(html)
+    parser.close()
+    return ["".join(chunks).strip() for chunks in parser.headings]
+
+
+def reflow(html: str) -> str:
+    """Cópia com as palavras dos títulos em linhas separadas e indentadas."""
+    def quebra(match):
+        open_tag, _, inner, close_tag = match.groups()
+        # Cada palavra num <span>: entre elas ficam nós só de espaços
+        inner = re.sub(
+            r"(^|>)([^<]*)",
+            lambda m: m.group(1) + "\n\t  ".join(
+                f"<span>{palavra}</span>" for palavra in m.group(2).split(" ")
+            ) if m.group(2).strip() else m.group(0),
+            inner,
+        )
+        return f"{open_tag}\n    {inner}\n  {close_tag}"
+
+    return HEADING_RE.sub(quebra, html)
+
+
+def parity_pages() -> dict:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        name = os.path.basename(path)
+        pages[name] = html
+        pages[name + " (quebrado)"] = reflow(html)
+    pages["sintética"] = build_page()
+    return pages
+
+
+def browser_headings(pages: dict) -> dict:
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        result = {}
+        for name, html in pages.items():
+            page.set_content(html, wait_until="domcontentloaded")
+            result[name] = page_headings(page)
+        browser.close()
+    return result
+
+
+def check_parity(browser: bool) -> bool:
+    pages = parity_pages()
+    caminhos = {"HeadingParser": extract_headings, "dom": dom_headings}
+    navegador = {}
+    if browser:
+        try:
+            navegador = browser_headings(pages)
+        except Exception as e:
+            print(f"  navegador: não rodou ({e.__class__.__name__}: {str(e).splitlines()[0]})")
+
+    ok = True
+    for name, html in pages.items():
+        esperado = bs4_headings(html)
+        outros = {nome: fn(html) for nome, fn in caminhos.items()}
+        if name in navegador:
+            outros["navegador"] = navegador[name]
+        for nome, headings in outros.items():
+            if headings != esperado:
+                ok = False
+                print(f"  {name}: {nome} difere do BeautifulSoup")
+                for a, b in zip(esperado, headings):
+                    if a != b:
+                        print(f"    {a!r} != {b!r}")
+                        break
+
+    print(f"paridade em {len(pages)} páginas ({', '.join(['bs4', *caminhos, *(['navegador'] if navegador else [])])}): {'OK' if ok else 'FALHOU'}")
+    return ok
+
+
+def measure(fn, html: str, runs: int) -> dict:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(html)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"median_ms": statistics.median(times) * 1000, "peak_kib": peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--browser", action="store_true")
+    args = parser.parse_args()
+
+    if not check_parity(args.browser):
+        sys.exit(1)
+
+    html = build_page()
+
+    old = measure(bs4_headings, html, args.runs)
+    new = measure(extract_headings, html, args.runs)
+
+    print(f"página de {len(html) / 1024:.0f} KiB, {args.runs} execuções")
+    print(f"  BeautifulSoup   {old['median_ms']:8.2f} ms  pico {old['peak_kib']:9.0f} KiB")
+    print(f"  HeadingParser   {new['median_ms']:8.2f} ms  pico {new['peak_kib']:9.0f} KiB")
+    print(
+        f"  tempo x{old['median_ms'] / new['median_ms']:.1f} menor, "
+        f"memória x{old['peak_kib'] / new['peak_kib']:.1f} menor"
+    )
+
+
+if __name__ == "__main__":
+    main()
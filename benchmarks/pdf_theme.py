@@ -0,0 +1,130 @@
+"""Compara o custo por semana do PDF antes e depois do PdfTheme.
+
+"antes" é a montagem original, que chamava `getSampleStyleSheet()`, criava
+os ParagraphStyle e o TableStyle de novo a cada semana e fazia o parse de
+todo parágrafo. "depois" é `pdf_export.week_elements`, com o tema montado
+uma vez por processo. Os dois caminhos precisam gerar PDFs idênticos.
+
+    python benchmarks/pdf_theme.py --weeks 52
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from pipeline import build_corpus, for_pdf
+from pdf_export import week_elements
+from scrapper.data_handling import Week, process_data
+from scrapper.headings import extract_headings
+
+
+def legacy_week_elements(data):
+    elements = []
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('TitleCustom', parent=styles['Title'], fontSize=18, textColor=colors.HexColor("#2c3e50"), spaceAfter=10)
+    subtitle_style = ParagraphStyle('SubtitleCustom', parent=styles['Normal'], fontSize=12, textColor=colors.gray, spaceAfter=20)
+
+    meta = data['metadata']
+    elements.append(Paragraph(f"Designações: Semana de {meta.get('data', '')}", title_style))
+    elements.append(Paragraph(f"Leitura: {meta.get('texto_biblico', '')} | {meta.get('introducao', '')}", subtitle_style))
+    elements.append(Spacer(1, 10))
+
+    for secao in data['secoes']:
+        titulo = secao.get('titulo', '')
+        bg_color = colors.HexColor("#7f8c8d")
+        if "TESOROS" in titulo.upper(): bg_color = colors.HexColor("#6c5ce7")
+        elif "MAESTROS" in titulo.upper(): bg_color = colors.HexColor("#f1c40f")
+        elif "VIDA" in titulo.upper(): bg_color = colors.HexColor("#e74c3c")
+
+        section_title = ParagraphStyle('SecTitle', parent=styles['Heading2'], fontSize=12, textColor=colors.white, backColor=bg_color, borderPadding=5, spaceAfter=5)
+        elements.append(Paragraph(titulo, section_title))
+
+        table_data = [["Parte", "Designado / Ajudante"]]
+        for item in secao['itens']:
+            full_name = item.get('nome', '')
+            if item.get('ajudante', ''):
+                full_name += f" / {item['ajudante']}"
+            if not full_name.strip():
+                full_name = "__________________________"
+            table_data.append([Paragraph(item.get('parte', ''), styles['Normal']), Paragraph(f"<b>{full_name}</b>", styles['Normal'])])
+
+        t = Table(table_data, colWidths=[300, 180])
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]))
+        elements.append(t)
+        elements.append(Spacer(1, 15))
+
+    if 'conclusao' in data:
+        elements.append(Paragraph(f"<b>Conclusão:</b> {data['conclusao']}", subtitle_style))
+    return elements
+
+
+def render(build_elements, data) -> bytes:
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build(build_elements(data))
+    return buffer.getvalue()
+
+
+def measure(build_elements, weeks: list, runs: int) -> dict:
+    elements_ms, render_ms = [], []
+    for _ in range(runs):
+        for data in weeks:
+            start = time.perf_counter()
+            build_elements(data)
+            elements_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            render(build_elements, data)
+            render_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "elements_ms": statistics.median(elements_ms),
+        "render_ms": statistics.median(render_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # PDFs sem data/ID aleatório, para comparar byte a byte
+    rl_config.invariant = 1
+    programs = [for_pdf(process_data(extract_headings(html))[0]) for html in build_corpus(args.weeks)]
+    weeks = [Week.from_program(program) for program in programs]
+    for program, week in zip(programs, weeks):
+        assert render(legacy_week_elements, program) == render(week_elements, week)
+
+    old = measure(legacy_week_elements, programs, args.runs)
+    new = measure(week_elements, weeks, args.runs)
+
+    print(f"{args.weeks} semanas, {args.runs} passadas (mediana por semana)")
+    print("                 elementos      PDF completo")
+    print(f"  antes        {old['elements_ms']:8.3f} ms   {old['render_ms']:8.3f} ms")
+    print(f"  PdfTheme     {new['elements_ms']:8.3f} ms   {new['render_ms']:8.3f} ms")
+    print(
+        f"  elementos x{old['elements_ms'] / new['elements_ms']:.1f} mais rápidos, "
+        f"PDF completo x{old['render_ms'] / new['render_ms']:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Mede cada etapa do pipeline sobre as páginas gravadas em benchmarks/fixtures.
+
+Roda sem rede e sem navegador. As páginas de semana são reaproveitadas em
+rodízio, trocando o rótulo do <h1> para que cada semana seja única, e cada
+etapa é medida separadamente:
+
+    cards     cards do índice do mês (BeautifulSoup + seletor, um por mês)
+    parse     títulos do HTML da semana (o que `scrape_data` devolve)
+    process   `process_data` sobre os títulos
+    store     `ScheduleStore.save_weeks`, uma transação por semana
+    pdf       `create_pdf_file`, um PDF por semana
+
+Para cada tamanho (1, 52 e 520 semanas, por padrão) sai o total, a vazão
+(semanas/s), p50/p95 por semana e o pico de memória (tracemalloc, numa
+passada separada para não distorcer os tempos). Com --output o resultado
+vai para um JSON que pode ser comparado entre versões.
+
+    python benchmarks/pipeline.py --output bench.json
+    python benchmarks/pipeline.py --sizes 1 52 --stages parse process
+
+As páginas da pasta fixtures reproduzem a estrutura das páginas do
+wol.jw.org (menus, scripts inline, cards, artigo da semana); não são cópias
+literais do site.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+from database import ScheduleStore
+from pdf_export import create_pdf_file
+from scrapper.data_handling import MESES, Week, process_data
+from scrapper.headings import extract_headings
+from scrapper.web_scrapper import MONTH_CARDS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+STAGES = ["cards", "parse", "process", "store", "pdf"]
+FIRST_MONDAY = date(2016, 1, 4)
+H1_LABEL_RE = re.compile(r"(<h1\b[^>]*><strong>)[^<]*(</strong>)")
+
+
+def load_fixtures() -> tuple[list[str], str]:
+    weeks = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.startswith("week_") and name.endswith(".html"):
+            with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+                weeks.append(f.read())
+
+    with open(os.path.join(FIXTURES, "month_index.html"), "r", encoding="utf-8") as f:
+        month_index = f.read()
+    return weeks, month_index
+
+
+def week_start(index: int) -> date:
+    return FIRST_MONDAY + timedelta(weeks=index)
+
+
+def week_label(index: int) -> str:
+    # Sem o ano, como no site: o banco acha o ano pela data de referência
+    start = week_start(index)
+    end = start + timedelta(days=6)
+    if start.month == end.month:
+        return f"{start.day}-{end.day} DE {MESES[end.month]}"
+    return f"{start.day} DE {MESES[start.month]} A {end.day} DE {MESES[end.month]}"
+
+
+def build_corpus(weeks: int) -> list[str]:
+    templates, _ = load_fixtures()
+    return [
+        H1_LABEL_RE.sub(
+            lambda m: m.group(1) + week_label(i) + m.group(2),
+            templates[i % len(templates)],
+            count=1,
+        )
+        for i in range(weeks)
+    ]
+
+
+def discover_cards(html: str) -> list[tuple[str, str]]:
+    # Mesmo caminho HTTP de DataScrapper._discover_cards
+    soup = BeautifulSoup(html, "html.parser")
+    return [(a.get_text(" "), a.get("href")) for a in soup.select(MONTH_CARDS) if a.get("href")]
+
+
+def for_pdf(program: dict) -> dict:
+    # A tela de edição entrega as partes como dicionários com as designações
+    return {
+        **program,
+        "secoes": [
+            {
+                "titulo": secao["titulo"],
+                "itens": [
+                    {"parte": item, "nome": "Nombre Apellido", "ajudante": ""}
+                    for item in secao["itens"]
+                ],
+            }
+            for secao in program["secoes"]
+        ],
+    }
+
+
+class Stages:
+    """Prepara as entradas de cada etapa e executa uma etapa por vez."""
+
+    def __init__(self, weeks: int, workdir: str):
+        self.weeks = weeks
+        self.workdir = workdir
+        self.pages = build_corpus(weeks)
+        _, self.month_index = load_fixtures()
+        self.headings = [extract_headings(html) for html in self.pages]
+        self.programs = [process_data(h)[0] for h in self.headings]
+        self.pdf_data = [Week.from_program(for_pdf(p)) for p in self.programs]
+        self._runs = 0
+
+    def units(self, stage: str) -> list:
+        if stage == "cards":
+            return [self.month_index] * max(1, self.weeks // 4)
+        if stage == "parse":
+            return self.pages
+        if stage == "process":
+            return self.headings
+        if stage == "store":
+            # Cada semana com uma data dela, como o backfill faz com o mês do card
+            return [(program, week_start(i)) for i, program in enumerate(self.programs)]
+        return list(enumerate(self.pdf_data))
+
+    def runner(self, stage: str):
+        """Função que processa uma unidade da etapa, e a limpeza depois da passada."""
+        self._runs += 1
+        if stage == "cards":
+            return discover_cards, None
+        if stage == "parse":
+            return extract_headings, None
+        if stage == "process":
+            return process_data, None
+        if stage == "store":
+            path = os.path.join(self.workdir, f"bench_{self._runs}.db")
+            store = ScheduleStore(path)
+
+            def cleanup():
+                store._connection().close()
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+
+            return (lambda unit: store.save_weeks(unit[0], reference=unit[1])), cleanup
+
+        pdf_dir = os.path.join(self.workdir, f"pdf_{self._runs}")
+        os.makedirs(pdf_dir)
+
+        def cleanup():
+            for name in os.listdir(pdf_dir):
+                os.remove(os.path.join(pdf_dir, name))
+            os.rmdir(pdf_dir)
+
+        def export(unit):
+            index, data = unit
+            create_pdf_file(os.path.join(pdf_dir, f"semana_{index}.pdf"), data)
+
+        return export, cleanup
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def run_stage(stages: Stages, stage: str, repeat: int) -> dict:
+    units = stages.units(stage)
+    latencies = []
+    totals = []
+
+    for _ in range(repeat):
+        fn, cleanup = stages.runner(stage)
+        start_total = time.perf_counter()
+        for unit in units:
+            start = time.perf_counter()
+            fn(unit)
+            latencies.append(time.perf_counter() - start)
+        totals.append(time.perf_counter() - start_total)
+        if cleanup:
+            cleanup()
+
+    # Passada separada com tracemalloc ligado
+    fn, cleanup = stages.runner(stage)
+    tracemalloc.start()
+    for unit in units:
+        fn(unit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if cleanup:
+        cleanup()
+
+    total = statistics.median(totals)
+    return {
+        "units": len(units),
+        "total_s": round(total, 6),
+        "throughput_per_s": round(len(units) / total, 2) if total else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 4),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 52, 520])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="passadas cronometradas por etapa")
+    parser.add_argument("--output", help="grava o resultado em JSON")
+    args = parser.parse_args()
+
+    result = {
+        "metadata": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for weeks in args.sizes:
+            stages = Stages(weeks, workdir)
+            result["results"][str(weeks)] = {}
+            print(f"{weeks} semana(s)")
+            for stage in args.stages:
+                stats = run_stage(stages, stage, args.repeat)
+                result["results"][str(weeks)][stage] = stats
+                print(
+                    f"  {stage:8} {stats['total_s'] * 1000:10.1f} ms  "
+                    f"{stats['throughput_per_s'] or 0:9.1f}/s  "
+                    f"p50 {stats['p50_ms']:8.3f} ms  p95 {stats['p95_ms']:8.3f} ms  "
+                    f"pico {stats['peak_memory_kib']:9.1f} KiB"
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"resultado salvo em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Mede quanto a espera por seletor economiza em relação ao evento `load`.
+
+Sobe um servidor local com páginas de semana que, além do programa, pedem
+um recurso lento (como os pixels de analytics do site). Cada página é
+visitada com `measure_readiness=True`: o scraper lê a página assim que o
+programa aparece e depois espera o `load`, só para medir a diferença.
+
+    python benchmarks/readiness.py --weeks 12 --background 1.5
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+from scrapper.web_scrapper import DataScrapper
+
+
+WEEK_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Semana {n}</title></head>
+<body><article id="article">
+<h1>{n}-{m} DE MARZO</h1>
+<h2>ISAÍAS {n}</h2>
+<h3>Canción {n} y oración</h3>
+<h2>TESOROS DE LA BIBLIA</h2>
+<h3>1. Lectura de la Biblia (4 mins.)</h3>
+<h2>SEAMOS MEJORES MAESTROS</h2>
+<h3>2. Empiece conversaciones (3 mins.)</h3>
+<h2>NUESTRA VIDA CRISTIANA</h2>
+<h3>3. Estudio bíblico de la congregación (30 mins.)</h3>
+<h3>Palabras de conclusión (3 mins.)</h3>
+</article>
+<img src="/pixel/{n}" alt="">
+</body></html>
+"""
+
+
+def start_server(latency, background):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/pixel/"):
+                time.sleep(background)
+                body, content_type = b"GIF89a", "image/gif"
+            else:
+                time.sleep(latency)
+                n = int(self.path.rsplit("/", 1)[-1] or 1)
+                body = WEEK_HTML.format(n=n, m=n + 6).encode("utf-8")
+                content_type = "text/html; charset=utf-8"
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--background", type=float, default=1.5, help="atraso do recurso lento (s)")
+    args = parser.parse_args()
+
+    server = start_server(args.latency, args.background)
+    base = f"http://127.0.0.1:{server.server_address[1]}/semana/"
+    urls = [f"{base}{n}" for n in range(1, args.weeks + 1)]
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+
+        scrapper = DataScrapper(concurrency=1, measure_readiness=True)
+        data = scrapper._browser_fetch_weeks(page, urls)
+        report = scrapper.last_readiness_report
+        scrapper.close()
+
+        assert [d[0] for d in data] == [f"{n}-{n + 6} DE MARZO" for n in range(1, args.weeks + 1)]
+        browser.close()
+    server.shutdown()
+
+    medidas = [r for r in report if "saved_s" in r]
+    print(f"{args.weeks} semanas, recurso lento de {args.background:.2f}s")
+    print(f"  pronta (seletor): mediana {statistics.median(r['ready_s'] for r in medidas):.2f}s")
+    print(f"  load:             mediana {statistics.median(r['baseline_s'] for r in medidas):.2f}s")
+    print(f"  economia total:   {sum(r['saved_s'] for r in medidas):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Mede o tempo de inicialização dos pontos de entrada.
+
+Cada caso roda em um processo novo (o cache de imports do Python não
+ajuda), várias vezes, e mostra a mediana do tempo de parede e os módulos
+pesados importados, segundo `python -X importtime`.
+
+    python benchmarks/startup.py --runs 7
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependências que valem a pena adiar
+HEAVY = ["flet", "reportlab", "playwright", "bs4", "httpx"]
+
+CASES = {
+    "import main": ["-c", "import main"],
+    "cli.py --help": ["cli.py", "--help"],
+    "cli.py pdf --help": ["cli.py", "pdf", "--help"],
+}
+
+
+def wall_time(args: list[str], runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args], cwd=ROOT, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def heavy_imports(args: list[str]) -> dict[str, float]:
+    """Tempo (ms) gasto importando cada dependência pesada, somando os submódulos.
+
+    Pacotes como o flet carregam submódulos sob demanda, então o tempo
+    acumulado do pacote raiz não mostra tudo.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=ROOT,
+        capture_output=True, text=True,
+    )
+    found = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        own, _, name = line.split("|")
+        package = name.strip().split(".")[0]
+        own = own.split(":")[1].strip()
+        if package in HEAVY and own.isdigit():
+            found[package] = found.get(package, 0) + int(own) / 1000
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = wall_time(["-c", "pass"], args.runs)
+    print(f"python vazio: {baseline * 1000:.0f} ms")
+
+    for name, case in CASES.items():
+        if case[0] == "cli.py" and not os.path.exists(os.path.join(ROOT, "cli.py")):
+            continue
+        elapsed = wall_time(case, args.runs)
+        print(f"{name:20} {elapsed * 1000:7.0f} ms  (+{(elapsed - baseline) * 1000:.0f} ms)")
+        found = heavy_imports(case)
+        print("    " + (", ".join(f"{m} {ms:.0f} ms" for m, ms in found.items()) or "nenhuma dependência pesada"))
+
+
+if __name__ == "__main__":
+    main()
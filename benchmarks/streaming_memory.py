@@ -0,0 +1,170 @@
+"""Confere que a memória da extração não cresce com o número de semanas.
+
+Sobe um servidor HTTP local que entrega as páginas de benchmarks/fixtures
+(com o rótulo do <h1> trocado, para cada semana ser única) e roda
+`DataScrapper._extract_weeks` do começo ao fim: HTTP, títulos,
+`process_data` por semana, `ScheduleStore.save_weeks` e o JSON gravado
+item a item. Cada tamanho roda em um processo novo, e o que se mede é o
+quanto o pico de memória residente (RSS) subiu durante a extração.
+
+A concorrência fica fixa (`--concurrency`, sem o ajuste do scheduler): o
+teto de memória depende de quantas páginas estão em andamento, não de
+quantas semanas passam. Com muitas threads baixando ao mesmo tempo, o
+alocador do sistema também guarda memória livre, que não volta para o
+sistema: o RSS sobe até um patamar nas primeiras centenas de páginas e
+para. Por isso a linha de base é tirada depois de `--warm-up` páginas.
+
+    stream   collect=False: nada da extração fica na memória (CLI, worker)
+    collect  collect=True: os programas são devolvidos no final
+
+Com `stream`, o aumento no maior tamanho não pode passar do aumento no
+menor mais `--tolerance` MB; se passar, o script sai com código 1.
+
+    python benchmarks/streaming_memory.py
+    python benchmarks/streaming_memory.py --sizes 52 1040 --modes stream --concurrency 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pipeline import H1_LABEL_RE, load_fixtures, week_label
+
+
+def start_server(templates: list[str]):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            n = int(self.path.rsplit("/", 1)[-1])
+            html = H1_LABEL_RE.sub(
+                lambda m: m.group(1) + week_label(n) + m.group(2),
+                templates[n % len(templates)],
+                count=1,
+            )
+            body = html.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_child(weeks: int, mode: str, concurrency: int, warm_up: int) -> dict:
+    """Uma extração de `weeks` semanas neste processo; devolve os números dela."""
+    from database import ScheduleStore
+    from scrapper.tracing import peak_rss_mb
+    from scrapper.web_scrapper import DataScrapper
+
+    templates, _ = load_fixtures()
+    server = start_server(templates)
+    base = f"http://127.0.0.1:{server.server_address[1]}/semana/"
+    urls = [f"{base}{n}" for n in range(weeks)]
+    warm_up_urls = [f"{base}{n}" for n in range(weeks, weeks + warm_up)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = ScheduleStore(os.path.join(workdir, "bench.db"))
+        scrapper = DataScrapper(concurrency=concurrency, max_concurrency=concurrency)
+        # Só o caminho da extração: sem o cache HTTP em disco e com o JSON no temporário
+        scrapper.http.cache = None
+        scrapper.json_dir = workdir
+        saved = 0
+
+        def on_week(program):
+            nonlocal saved
+            store.save_weeks(program)
+            saved += 1
+
+        # Aquece o caminho todo (imports, conexões, banco, alocador) antes da linha de base
+        scrapper._extract_weeks(warm_up_urls, on_week=on_week, collect=False)
+        saved = 0
+        baseline = peak_rss_mb()
+
+        start = time.perf_counter()
+        programs = scrapper._extract_weeks(
+            urls, on_week=on_week, filename="bench.json", collect=mode == "collect"
+        )
+        elapsed = time.perf_counter() - start
+        peak = peak_rss_mb()
+
+        scrapper.http.close()
+        store._connection().close()
+    server.shutdown()
+
+    return {
+        "weeks": weeks,
+        "mode": mode,
+        "concurrency": concurrency,
+        "saved": saved,
+        "returned": len(programs),
+        "total_s": round(elapsed, 3),
+        "baseline_mb": round(baseline, 1),
+        "peak_mb": round(peak, 1),
+        "growth_mb": round(peak - baseline, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[52, 260, 1040])
+    parser.add_argument("--modes", nargs="+", choices=["stream", "collect"], default=["stream", "collect"])
+    parser.add_argument("--concurrency", type=int, default=4, help="páginas em andamento")
+    parser.add_argument("--warm-up", type=int, default=200, help="páginas antes da linha de base")
+    parser.add_argument("--tolerance", type=float, default=8, help="MB a mais tolerados no maior tamanho")
+    parser.add_argument("--child", nargs=2, metavar=("SEMANAS", "MODO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(int(args.child[0]), args.child[1], args.concurrency, args.warm_up)))
+        return 0
+
+    results = {}
+    for mode in args.modes:
+        for weeks in args.sizes:
+            # Processo novo por medida: o pico de RSS só sobe dentro de um processo
+            output = subprocess.run(
+                [
+                    sys.executable, os.path.abspath(__file__),
+                    "--child", str(weeks), mode,
+                    "--concurrency", str(args.concurrency), "--warm-up", str(args.warm_up),
+                ],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results[mode, weeks] = result
+            print(
+                f"{mode:8} {weeks:6} semanas  {result['total_s']:7.2f}s  "
+                f"pico {result['peak_mb']:7.1f} MB  (+{result['growth_mb']:.1f} MB na extração)"
+            )
+
+    if "stream" not in args.modes:
+        return 0
+
+    smallest = results["stream", min(args.sizes)]["growth_mb"]
+    largest = results["stream", max(args.sizes)]["growth_mb"]
+    flat = largest <= smallest + args.tolerance
+    print(
+        f"stream: +{smallest:.1f} MB com {min(args.sizes)} semanas, "
+        f"+{largest:.1f} MB com {max(args.sizes)} -> {'OK' if flat else 'CRESCEU'}"
+    )
+    return 0 if flat else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Extrações e exportação de PDFs pela linha de comando, sem abrir o Flet.
+
+    python cli.py month
+    python cli.py all --no-skip
+    python cli.py backfill 2022 2025
+    python cli.py pdf --de 2025-03-01 --ate 2025-05-31 --combinado
+    python cli.py list --limite 10
+
+Cada comando importa só o que usa: `pdf` e `list` não carregam o scraper,
+e as extrações não carregam o ReportLab.
+"""
+import argparse
+import os
+import sys
+
+
+def open_store(args):
+    from database import ScheduleStore
+
+    store = ScheduleStore(args.db)
+    store.import_json(os.path.join("json", "saved_schedules.json"))
+    return store
+
+
+def print_progress(feitas, total):
+    print(f"\r{feitas}/{total}", end="", file=sys.stderr, flush=True)
+
+
+def run_extraction(args):
+    from scrapper import tracing
+    from scrapper.web_scrapper import DataScrapper
+
+    store = open_store(args)
+    scrapper = DataScrapper(headless=not args.headed)
+    known = set() if args.no_skip else store.known_weeks()
+    saved = 0
+
+    # Cada semana vai para o banco assim que chega; a lista não é montada
+    def on_week(program):
+        nonlocal saved
+        with tracing.span("store_save"):
+            store.save_weeks(program)
+        saved += 1
+        print(f"\r✓ {program['metadata']['data']}", file=sys.stderr)
+
+    options = {"on_week": on_week, "on_progress": print_progress, "collect": False}
+    tasks = {
+        "week": lambda: scrapper.extract_this_week(**options),
+        "month": lambda: scrapper.extract_this_month(known, **options),
+        "all": lambda: scrapper.extract_all_available_weeks(known, **options),
+    }
+
+    tracer = tracing.Tracer(f"cli {args.command}")
+    token = tracing.current_trace.set(tracer)
+    try:
+        tasks[args.command]()
+    finally:
+        tracing.current_trace.reset(token)
+        tracer.finish()
+        scrapper.close()
+
+    print(f"\n{saved} semana(s) extraídas")
+    print(tracer.summary_text())
+    print(f"Trace salvo em: {tracer.save(os.path.join('json', 'traces'))}")
+    return 0 if saved else 1
+
+
+def run_backfill(args):
+    from datetime import datetime
+    from scrapper.backfill import ArchiveBackfill
+    from scrapper.web_scrapper import DataScrapper
+
+    store = open_store(args)
+    scrapper = DataScrapper(headless=not args.headed)
+    last_year = args.ate or datetime.now().year
+    try:
+        result = ArchiveBackfill(scrapper, store).run(
+            args.de, last_year,
+            on_week=lambda program: print(f"✓ {program['metadata']['data']}", file=sys.stderr),
+        )
+    finally:
+        scrapper.close()
+
+    print(
+        f"{result['weeks_saved']} semana(s) salvas, "
+        f"{result['pages_failed']} página(s) com erro"
+    )
+    return 1 if result["pages_failed"] else 0
+
+
+def run_pdf(args):
+    from datetime import date
+    from pdf_export import export_weeks
+
+    store = open_store(args)
+    weeks = store.weeks_between(date.fromisoformat(args.de), date.fromisoformat(args.ate))
+    if not weeks:
+        print("Nenhuma semana salva nesse intervalo")
+        return 1
+
+    paths = export_weeks(
+        weeks, args.pasta, combined=args.combinado, workers=args.processos,
+        on_progress=print_progress,
+    )
+    print()
+    for path in paths:
+        print(path)
+    return 0
+
+
+def run_list(args):
+    store = open_store(args)
+    print(f"{store.count_weeks()} semana(s) no histórico")
+    for _, label, start in store.week_entries(0, args.limite):
+        print(f"  {start or '?':10}  {label}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Schedule Manager pela linha de comando")
+    parser.add_argument("--db", default="escala.db", help="banco do histórico (padrão: escala.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, ajuda in [
+        ("week", "extrai a semana atual"),
+        ("month", "extrai as semanas do mês a partir da atual"),
+        ("all", "extrai todas as semanas disponíveis do ano a partir da atual"),
+    ]:
+        command = commands.add_parser(name, help=ajuda)
+        command.add_argument("--no-skip", action="store_true", help="baixa de novo as semanas já salvas")
+        command.add_argument("--headed", action="store_true", help="mostra o navegador, se ele for usado")
+        command.set_defaults(handler=run_extraction)
+
+    backfill = commands.add_parser("backfill", help="monta o arquivo de vários anos (retomável)")
+    backfill.add_argument("de", type=int, help="primeiro ano")
+    backfill.add_argument("ate", type=int, nargs="?", help="último ano (padrão: o atual)")
+    backfill.add_argument("--headed", action="store_true", help="mostra o navegador, se ele for usado")
+    backfill.set_defaults(handler=run_backfill)
+
+    pdf = commands.add_parser("pdf", help="gera os PDFs das semanas salvas em um intervalo")
+    pdf.add_argument("--de", required=True, help="data inicial (AAAA-MM-DD)")
+    pdf.add_argument("--ate", required=True, help="data final (AAAA-MM-DD)")
+    pdf.add_argument("--combinado", action="store_true", help="um único PDF com todas as semanas")
+    pdf.add_argument("--pasta", default="pdf", help="pasta de saída (padrão: pdf)")
+    pdf.add_argument("--processos", type=int, help="processos em paralelo (padrão: um por CPU)")
+    pdf.set_defaults(handler=run_pdf)
+
+    listing = commands.add_parser("list", help="mostra as semanas salvas")
+    listing.add_argument("--limite", type=int, default=20)
+    listing.set_defaults(handler=run_list)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from scrapper.data_handling import Part, Section, Week
+import json
+import os
+import sqlite3
+import threading
+
+
+# week_key: a segunda-feira da semana (ISO) ou, se o rótulo não tem data, o
+# rótulo normalizado (ver `week_key`); o rótulo sozinho se repete entre anos
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weeks (
+    id INTEGER PRIMARY KEY,
+    week_key TEXT NOT NULL UNIQUE,
+    label TEXT NOT NULL,
+    start_date TEXT,
+    texto_biblico TEXT,
+    introducao TEXT,
+    conclusao TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_weeks_start_date ON weeks (start_date);
+
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    week_id INTEGER NOT NULL REFERENCES weeks (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    titulo TEXT NOT NULL,
+    kind TEXT,
+    UNIQUE (week_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS parts (
+    id INTEGER PRIMARY KEY,
+    section_id INTEGER NOT NULL REFERENCES sections (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    texto TEXT NOT NULL,
+    number INTEGER,
+    title TEXT,
+    minutes INTEGER,
+    UNIQUE (section_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    part_id INTEGER PRIMARY KEY REFERENCES parts (id) ON DELETE CASCADE,
+    nome TEXT,
+    ajudante TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ScheduleStore:
+    """Histórico das programações extraídas, guardado em SQLite (escala.db).
+
+    Cada thread usa a sua própria conexão; as gravações acontecem dentro de
+    transações `BEGIN IMMEDIATE` e o banco roda em modo WAL, então leituras
+    não esperam as gravações e duas extrações terminando juntas não se
+    atropelam.
+    """
+
+    # No JSON antigo, uma semana pode ter sido salva até HISTORY_LOOKAHEAD_DAYS
+    # antes de começar (a apostila sai com antecedência); uma que fique mais de
+    # HISTORY_MAX_GAP_DAYS antes da sua referência entra sem ano (start_date
+    # NULL) em vez de ganhar um ano chutado
+    HISTORY_LOOKAHEAD_DAYS = 70
+    HISTORY_MAX_GAP_DAYS = 120
+
+    def __init__(self, path: str = "escala.db"):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def save_weeks(self, programs, reference=None) -> int:
+        """Insere ou atualiza as semanas (Week ou no formato de `process_data`).
+
+        Cada semana é identificada pela segunda-feira dela (`Week.key`).
+        Para programas em dicionário, `reference` é uma data próxima das
+        semanas, usada para descobrir o ano que o rótulo não traz; por
+        padrão, hoje. Uma Week já traz a data dela.
+        """
+        if not isinstance(programs, list):
+            programs = [programs]
+
+        with self._transaction() as conn:
+            for program in programs:
+                self._upsert_week(conn, program, reference)
+        return len(programs)
+
+    @staticmethod
+    def _upsert_week(conn, week, reference=None):
+        if not isinstance(week, Week):
+            week = Week.from_program(week, reference)
+
+        week_id = conn.execute(
+            """
+            INSERT INTO weeks (week_key, label, start_date, texto_biblico, introducao, conclusao, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (week_key) DO UPDATE SET
+                label = excluded.label,
+                start_date = excluded.start_date,
+                texto_biblico = excluded.texto_biblico,
+                introducao = excluded.introducao,
+                conclusao = excluded.conclusao,
+                updated_at = excluded.updated_at
+            RETURNING id
+            """,
+            (
+                week.key,
+                week.label,
+                week.start.isoformat() if week.start else None,
+                week.reading,
+                week.introduction,
+                week.conclusion,
+                datetime.now().isoformat(timespec="seconds"),
+            ),
+        ).fetchone()[0]
+
+        # Atualiza por posição para não perder as designações já preenchidas
+        for position, section in enumerate(week.sections):
+            section_id = conn.execute(
+                """
+                INSERT INTO sections (week_id, position, titulo, kind) VALUES (?, ?, ?, ?)
+                ON CONFLICT (week_id, position) DO UPDATE SET
+                    titulo = excluded.titulo,
+                    kind = excluded.kind
+                RETURNING id
+                """,
+                (week_id, position, section.title, section.kind),
+            ).fetchone()[0]
+
+            for part_position, part in enumerate(section.parts):
+                conn.execute(
+                    """
+                    INSERT INTO parts (section_id, position, texto, number, title, minutes)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (section_id, position) DO UPDATE SET
+                        texto = excluded.texto,
+                        number = excluded.number,
+                        title = excluded.title,
+                        minutes = excluded.minutes
+                    """,
+                    (section_id, part_position, part.text, part.number, part.title, part.minutes),
+                )
+            conn.execute(
+                "DELETE FROM parts WHERE section_id = ? AND position >= ?",
+                (section_id, len(section.parts)),
+            )
+
+        conn.execute(
+            "DELETE FROM sections WHERE week_id = ? AND position >= ?",
+            (week_id, len(week.sections)),
+        )
+
+    def known_weeks(self) -> set[str]:
+        """Chaves (`Week.key`) de todas as semanas salvas."""
+        rows = self._connection().execute("SELECT week_key FROM weeks")
+        return {row["week_key"] for row in rows}
+
+    def list_weeks(self) -> list[Week]:
+        """Todas as semanas, da mais recente para a mais antiga."""
+        conn = self._connection()
+        weeks = conn.execute(
+            "SELECT * FROM weeks ORDER BY start_date DESC, label"
+        ).fetchall()
+        return [self._load_week(conn, week) for week in weeks]
+
+    def count_weeks(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM weeks").fetchone()[0]
+
+    def week_entries(self, offset: int = 0, limit: int = 50) -> list[tuple[str, str, str | None]]:
+        """Uma página de (chave, rótulo, segunda-feira), na mesma ordem de `list_weeks`."""
+        rows = self._connection().execute(
+            "SELECT week_key, label, start_date FROM weeks ORDER BY start_date DESC, label LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        return [(row["week_key"], row["label"], row["start_date"]) for row in rows]
+
+    def load_week(self, key: str) -> Week | None:
+        """Semana pela chave (`Week.key`)."""
+        conn = self._connection()
+        week = conn.execute("SELECT * FROM weeks WHERE week_key = ?", (key,)).fetchone()
+        if week is None:
+            return None
+        return self._load_week(conn, week)
+
+    def weeks_between(self, start, end) -> list[Week]:
+        """Semanas que começam entre `start` e `end` (inclusive), em ordem."""
+        conn = self._connection()
+        weeks = conn.execute(
+            "SELECT * FROM weeks WHERE start_date BETWEEN ? AND ? ORDER BY start_date",
+            (start.isoformat(), end.isoformat()),
+        ).fetchall()
+        return [self._load_week(conn, week) for week in weeks]
+
+    def save_assignments(self, week: Week, parts=None) -> None:
+        """Grava os designados (`name`/`helper` das partes) de uma semana já salva.
+
+        `parts` são as posições (seção, parte) a gravar, as que foram
+        editadas; as outras ficam como estão no banco. Sem `parts`, grava
+        todas.
+        """
+        parts = set(parts) if parts is not None else None
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM weeks WHERE week_key = ?", (week.key,)
+            ).fetchone()
+            if row is None:
+                return
+
+            for position, section in enumerate(week.sections):
+                for part_position, part in enumerate(section.parts):
+                    if parts is not None and (position, part_position) not in parts:
+                        continue
+                    conn.execute(
+                        """
+                        INSERT INTO assignments (part_id, nome, ajudante)
+                        SELECT parts.id, ?, ? FROM parts
+                        JOIN sections ON sections.id = parts.section_id
+                        WHERE sections.week_id = ? AND sections.position = ? AND parts.position = ?
+                        ON CONFLICT (part_id) DO UPDATE SET
+                            nome = excluded.nome,
+                            ajudante = excluded.ajudante
+                        """,
+                        (part.name, part.helper, row["id"], position, part_position),
+                    )
+
+    @staticmethod
+    def _load_week(conn, week) -> Week:
+        """Week de uma linha de `weeks`, com os designados já gravados."""
+        sections = []
+        rows = conn.execute(
+            "SELECT id, titulo, kind FROM sections WHERE week_id = ? ORDER BY position",
+            (week["id"],),
+        ).fetchall()
+        for section in rows:
+            parts = conn.execute(
+                """
+                SELECT texto, number, title, minutes, nome, ajudante FROM parts
+                LEFT JOIN assignments ON assignments.part_id = parts.id
+                WHERE section_id = ? ORDER BY position
+                """,
+                (section["id"],),
+            ).fetchall()
+            sections.append(Section(section["titulo"], section["kind"], [
+                Part(
+                    p["texto"], p["number"], p["title"] or "", p["minutes"],
+                    p["nome"] or "", p["ajudante"] or "",
+                )
+                for p in parts
+            ]))
+
+        return Week(
+            week["label"], week["texto_biblico"], week["introducao"],
+            sections, week["conclusao"],
+            date.fromisoformat(week["start_date"]) if week["start_date"] else None,
+        )
+
+    @classmethod
+    def _history_weeks(cls, programs: list[dict], modified: date) -> list[Week]:
+        """Semanas do JSON antigo, com o ano deduzido da ordem em que foram salvas.
+
+        Os rótulos não têm ano e o arquivo só ganhava semanas no fim: a última
+        foi salva até `modified` (a data de modificação do arquivo), e cada uma
+        das anteriores, antes da seguinte. Cada semana usa como referência a
+        data da semana salva depois dela e fica no último ano que não a põe
+        depois da referência mais a antecedência; se ainda assim ficar longe
+        demais, o ano não é confiável e a semana entra sem data.
+        """
+        weeks = []
+        reference = modified
+        for program in reversed(programs):
+            # `parse_week_range` escolhe o fim de semana mais próximo da
+            # referência; meio ano antes do limite, ele cai no ano até o limite
+            limit = reference + timedelta(days=cls.HISTORY_LOOKAHEAD_DAYS)
+            week = Week.from_program(program, limit - timedelta(days=182))
+            if week.start is not None:
+                if abs((week.start - reference).days) <= cls.HISTORY_MAX_GAP_DAYS:
+                    reference = week.start
+                else:
+                    week.start = None
+            weeks.append(week)
+
+        weeks.reverse()
+        return weeks
+
+    def import_json(self, path: str) -> int:
+        """Importa, uma única vez, o histórico antigo em JSON (saved_schedules.json)."""
+        conn = self._connection()
+        done = conn.execute(
+            "SELECT value FROM meta WHERE key = 'json_importado'"
+        ).fetchone()
+        if done or not os.path.exists(path):
+            return 0
+
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                programs = json.load(f)
+            except ValueError:
+                programs = []
+
+        modified = datetime.fromtimestamp(os.path.getmtime(path)).date()
+        weeks = self._history_weeks(programs, modified)
+
+        with self._transaction() as conn:
+            for week in weeks:
+                self._upsert_week(conn, week)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_importado', ?)",
+                (path,),
+            )
+        return len(programs)
@@ -1,16 +1,47 @@
 import flet as ft
-import json
+import asyncio
+import atexit
+import copy
 import os
 import threading
-from scrapper.web_scrapper import DataScrapper
-
-# Bibliotecas para PDF
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import partial
+from database import ScheduleStore
+from scrapper import tracing
+from scrapper.data_handling import Week
+from scrapper.jobs import Job, JobCancelled, JobManager
 
 class ProgramApp:
+    SELECTOR_PAGE_SIZE = 50
+    DETAIL_CACHE_SIZE = 8
+    # Extrações em um processo separado: um navegador travado ou caído não
+    # derruba a interface. False roda o AsyncDataScrapper no próprio app
+    SCRAPER_IN_WORKER = True
+
+    # Section.kind -> (ícone, cor) da seção na tela de edição
+    SECTION_THEMES = {
+        "tesoros": (ft.Icons.DIAMOND, "#a5b4fc"),
+        "maestros": (ft.Icons.WORK, "#fbbf24"),
+        "vida": (ft.Icons.FAVORITE, "#f87171"),
+    }
+    DEFAULT_SECTION_THEME = (ft.Icons.CIRCLE, "#94a3b8")
+
+    # Tempo máximo (s) de cada extração antes de ela ser interrompida
+    JOB_TIMEOUTS = {
+        "Extract This Week": 120,
+        "Extract Month": 600,
+        "Extract All Available": 1800,
+    }
+    JOB_STATUS = {
+        Job.PENDING: "na fila",
+        Job.RUNNING: "em andamento",
+        Job.DONE: "concluída",
+        Job.FAILED: "falhou",
+        Job.CANCELLED: "cancelada",
+        Job.TIMEOUT: "tempo esgotado",
+    }
+
     def __init__(self, page: ft.Page):
         self.page = page
         self.page.title = "Schedule Manager"
@@ -19,8 +50,21 @@ class ProgramApp:
         self.page.padding = 0
         self.page.theme_mode = ft.ThemeMode.DARK
         self.page.bgcolor = "#0a0e1a"
-        self.scrapper = DataScrapper()
+        # O scraper (Playwright, httpx, BeautifulSoup) só é carregado no primeiro uso;
+        # ele roda no loop de eventos do Flet, sem uma thread por extração
+        self._scrapper = None
+        self._scrapper_lock = threading.Lock()
+        # Uma extração por vez; pedidos repetidos reaproveitam a que está na fila
+        self.jobs = JobManager(max_jobs=1, on_change=self._on_job_change)
+        self.job_status_text = None
+        self.last_trace = None
+        # Os navegadores do scraper ficam abertos até o app fechar
+        self.page.on_close = lambda _: self.close()
+        atexit.register(self.close)
         self.json_history = os.path.join("json", "saved_schedules.json")
+        # Histórico em SQLite; o JSON antigo é importado só na primeira vez
+        self.store = ScheduleStore("escala.db")
+        self.store.import_json(self.json_history)
         
         # Status de extração
         self.extraction_status = None
@@ -32,6 +76,18 @@ class ProgramApp:
         
         self.show_main_menu()
 
+    @property
+    def scrapper(self):
+        with self._scrapper_lock:
+            if self._scrapper is None:
+                if self.SCRAPER_IN_WORKER:
+                    from scrapper.worker import WorkerScrapper
+                    self._scrapper = WorkerScrapper()
+                else:
+                    from scrapper.async_scrapper import AsyncDataScrapper
+                    self._scrapper = AsyncDataScrapper()
+            return self._scrapper
+
     def show_main_menu(self):
         self.page.controls.clear()
         
@@ -181,6 +237,8 @@ class ProgramApp:
 
     def show_vida_ministerio(self, e):
         self.page.controls.clear()
+        # Já carrega o scraper e abre um navegador em segundo plano para a primeira extração
+        self.page.run_task(self._warm_up)
         
         # Botão de voltar estilizado
         back_button = ft.Container(
@@ -253,12 +311,17 @@ class ProgramApp:
             create_action_button("Extract Month", ft.Icons.CALENDAR_MONTH, self.extract_month),
             create_action_button("Extract All Available", ft.Icons.DOWNLOAD, self.extract_all),
             create_action_button("View Saved Schedules", ft.Icons.FOLDER_OPEN, self.view_saved),
+            create_action_button("Export PDFs", ft.Icons.PICTURE_AS_PDF, self.show_export),
         ], spacing=15, horizontal_alignment=ft.CrossAxisAlignment.CENTER)
         
+        # Status das extrações, atualizado pelo JobManager
+        self.job_status_text = ft.Text(self._jobs_summary(), size=13, color="#94a3b8")
+
         main_content = ft.Column([
             ft.Container(back_button, padding=ft.Padding(left=20, top=20)),
             header,
             buttons_column,
+            self.job_status_text,
         ],
         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
         spacing=10,
@@ -402,36 +465,85 @@ class ProgramApp:
 
 
     def save_to_history(self, new_data):
-        if not isinstance(new_data, list): new_data = [new_data]
-        total = []
-        if os.path.exists(self.json_history):
-            with open(self.json_history, 'r', encoding='utf-8') as f:
-                try: total = json.load(f)
-                except: total = []
-        
-        dates = {d['metadata']['data'] for d in total}
-        for d in new_data:
-            if d['metadata']['data'] not in dates: total.append(d)
-        
-        with open(self.json_history, 'w', encoding='utf-8') as f:
-            json.dump(total, f, indent=4, ensure_ascii=False)
+        self.store.save_weeks(new_data)
 
     def extract_week(self, e):
-        threading.Thread(target=self._run_task, args=(self.scrapper.extract_this_week,), daemon=False).start()
+        self._start_job("Extract This Week", lambda **kw: self.scrapper.extract_this_week(**kw))
+
+    def known_weeks(self):
+        """Chaves (`Week.key`) das semanas que já estão no histórico"""
+        return self.store.known_weeks()
 
     def extract_month(self, e):
-        threading.Thread(target=self._run_task, args=(self.scrapper.extract_this_month,), daemon=False).start()
+        # Só baixa as semanas que ainda não foram salvas
+        known = self.known_weeks()
+        self._start_job("Extract Month", lambda **kw: self.scrapper.extract_this_month(known_weeks=known, **kw))
 
     def extract_all(self, e):
-        threading.Thread(target=self._run_task, args=(self.scrapper.extract_all_available_weeks,), daemon=False).start()
+        known = self.known_weeks()
+        self._start_job("Extract All Available", lambda **kw: self.scrapper.extract_all_available_weeks(known_weeks=known, **kw))
+
+    async def _warm_up(self):
+        # Os imports do scraper ficam fora do loop de eventos
+        scrapper = await asyncio.to_thread(lambda: self.scrapper)
+        await scrapper.warm_up()
+
+    def _start_job(self, key, task_func):
+        job, criado = self.jobs.submit_async(
+            key, partial(self._run_task, task_func, key), self.page.run_task,
+            timeout=self.JOB_TIMEOUTS.get(key),
+        )
+        if not criado:
+            self.page.snack_bar = ft.SnackBar(
+                ft.Text(f"⚠ {key} já está {self.JOB_STATUS[job.status]}", color="#f59e0b"),
+                bgcolor="#0f172a"
+            )
+            self.page.snack_bar.open = True
+            self.page.update()
+
+    def _jobs_summary(self):
+        return " · ".join(f"{job.key}: {self.JOB_STATUS[job.status]}" for job in self.jobs.active())
+
+    def _on_job_change(self, job):
+        if self.job_status_text is None:
+            return
+        self.job_status_text.value = self._jobs_summary() or f"{job.key}: {self.JOB_STATUS[job.status]}"
+        try:
+            self.job_status_text.update()
+        except Exception:
+            # A tela com o status já foi trocada
+            pass
+
+    def close(self):
+        self.jobs.shutdown()
+        if self._scrapper is not None:
+            try:
+                self.page.run_task(self._scrapper.close)
+            except Exception:
+                # O loop do Flet já terminou; o navegador sai junto com o processo
+                pass
 
-    def _run_task(self, task_func):
+    async def _run_task(self, task_func, key=None):
+        # O seletor abre na hora e recebe cada semana assim que ela é lida
+        recebidas = []
+        self.show_selector([], streaming=True, on_cancel=lambda: self.jobs.cancel(key))
+
+        def on_week(program):
+            # Lida uma vez só: o banco e a tela usam a mesma Week
+            week = Week.from_program(program)
+            with tracing.span("store_save"):
+                self.save_to_history(week)
+            recebidas.append(program)
+            self.selector_add_week(week)
+
+        # Tempos por etapa da extração, gravados em json/traces
+        tracer = tracing.Tracer(key or "extracao")
+        token = tracing.current_trace.set(tracer)
         try:
-            data = task_func()
-            if data:
-                self.save_to_history(data)
+            data = await task_func(on_week=on_week, on_progress=self.selector_progress)
+            if data or recebidas:
                 # Armazenar dados para navegação na thread principal
-                self.extracted_data = data
+                self.extracted_data = data or recebidas
                 self.extraction_status = "success"
                 # Mostrar notificação de sucesso
                 self.page.snack_bar = ft.SnackBar(
@@ -440,11 +552,10 @@ class ProgramApp:
                 )
                 self.page.snack_bar.open = True
                 self.page.update()
-                # Navegar para a tela de seleção na thread principal
-                self.show_selector(data)
             else:
                 self.extraction_status = "no_data"
                 self.extracted_data = None
+                self.show_vida_ministerio(None)
                 # Mostrar notificação de nenhum dado
                 self.page.snack_bar = ft.SnackBar(
                     ft.Text("⚠ Nenhum dado foi encontrado", color="#f59e0b"),
@@ -452,11 +563,22 @@ class ProgramApp:
                 )
                 self.page.snack_bar.open = True
                 self.page.update()
+        except (JobCancelled, asyncio.CancelledError) as e:
+            self.extraction_status = "cancelled"
+            self.extracted_data = recebidas or None
+            self.page.snack_bar = ft.SnackBar(
+                ft.Text(f"✗ Extração interrompida ({str(e) or 'cancelada'}); {len(recebidas)} semana(s) salvas", color="#f59e0b"),
+                bgcolor="#0f172a"
+            )
+            self.page.snack_bar.open = True
+            self.page.update()
+            # Repassa para o JobManager registrar cancelamento/timeout
+            raise
         except Exception as e:
             print(f"Erro ao extrair dados: {str(e)}")
             self.extraction_status = "error"
             self.extraction_error = str(e)
-            self.extracted_data = None
+            self.extracted_data = recebidas or None
             # Mostrar erro
             self.page.snack_bar = ft.SnackBar(
                 ft.Text(f"✗ Erro: {str(e)}", color="#ef4444"),
@@ -465,40 +587,148 @@ class ProgramApp:
             self.page.snack_bar.open = True
             self.page.update()
         finally:
-            # Limpar recursos do scraper explicitamente
+            tracing.current_trace.reset(token)
+            tracer.finish()
+            self.last_trace = tracer
             try:
-                if hasattr(self, 'scrapper') and self.scrapper is not None:
-                    if hasattr(self.scrapper, 'playwright') and self.scrapper.playwright:
-                        try:
-                            self.scrapper.playwright.stop()
-                        except:
-                            pass
-                    if hasattr(self.scrapper, 'browser') and self.scrapper.browser:
-                        try:
-                            self.scrapper.browser.close()
-                        except:
-                            pass
-            except:
-                pass
+                print(f"Trace salvo em: {tracer.save(os.path.join('json', 'traces'))}")
+            except OSError as e:
+                print(f"Erro ao salvar o trace: {e}")
+            self.selector_done(tracer.summary_text())
 
     def view_saved(self, e):
-        if os.path.exists(self.json_history):
-            with open(self.json_history, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            # self.show_selector(data)
+        # A lista vem do banco aos poucos, conforme a rolagem
+        self.show_selector()
 
 
-    def show_selector(self, data_list):
+    def show_export(self, e):
+        """Tela para gerar os PDFs de um intervalo de semanas do histórico"""
         self.page.controls.clear()
-        
-        # Dicionário para guardar as referências dos inputs (TextFields)
-        self.input_controls = {} 
 
-        # Ordenar dados por data
-        try:
-            data_list.sort(key=lambda x: x['metadata'].get('data', ''), reverse=True)
-        except:
-            pass 
+        # Padrão: o trimestre a partir da segunda-feira desta semana
+        inicio = date.today() - timedelta(days=date.today().weekday())
+        fim = inicio + timedelta(weeks=12)
+
+        txt_inicio = ft.TextField(label="De (AAAA-MM-DD)", value=inicio.isoformat(), width=190, bgcolor="#0f172a", border_color="#334155")
+        txt_fim = ft.TextField(label="Até (AAAA-MM-DD)", value=fim.isoformat(), width=190, bgcolor="#0f172a", border_color="#334155")
+        chk_combinado = ft.Checkbox(label="Um único PDF com todas as semanas", value=False)
+        progress_bar = ft.ProgressBar(width=400, value=0, visible=False, color="#6366f1", bgcolor="#1e293b")
+        status_text = ft.Text("", size=13, color="#94a3b8")
+
+        def on_progress(feitos, total):
+            progress_bar.value = feitos / total
+            status_text.value = f"{feitos} de {total} PDF(s) gerados"
+            self.page.update()
+
+        def run_export():
+            from pdf_export import export_weeks
+
+            try:
+                weeks = self.store.weeks_between(
+                    date.fromisoformat(txt_inicio.value.strip()),
+                    date.fromisoformat(txt_fim.value.strip()),
+                )
+            except ValueError:
+                status_text.value = "Datas inválidas, use AAAA-MM-DD"
+                self.page.update()
+                return
+
+            if not weeks:
+                status_text.value = "Nenhuma semana salva nesse intervalo"
+                self.page.update()
+                return
+
+            progress_bar.value = 0
+            progress_bar.visible = True
+            status_text.value = f"Gerando {len(weeks)} semana(s)..."
+            self.page.update()
+
+            try:
+                paths = export_weeks(weeks, "pdf", combined=chk_combinado.value, on_progress=on_progress)
+                status_text.value = f"✓ {len(paths)} PDF(s) salvos em: pdf"
+            except Exception as e:
+                print(f"Erro ao gerar PDFs: {str(e)}")
+                status_text.value = f"✗ Erro: {str(e)}"
+            self.page.update()
+
+        back_button = ft.Container(
+            content=ft.Row([
+                ft.Icon(ft.Icons.ARROW_BACK, size=20, color="#6366f1"),
+                ft.Text("Voltar", size=14, color="#6366f1", weight=ft.FontWeight.BOLD)
+            ], spacing=8),
+            bgcolor="#1e293b",
+            border_radius=8,
+            padding=ft.Padding(left=16, right=16, top=10, bottom=10),
+            ink=True,
+            on_click=lambda _: self.show_vida_ministerio(None)
+        )
+
+        content = ft.Column([
+            ft.Container(back_button, padding=ft.Padding(left=20, top=20)),
+            ft.Container(
+                content=ft.Column([
+                    ft.Icon(ft.Icons.PICTURE_AS_PDF, size=50, color="#6366f1"),
+                    ft.Text("Exportar PDFs", size=24, weight=ft.FontWeight.BOLD, color="#ffffff"),
+                    ft.Text("Gera as designações salvas de várias semanas de uma vez", size=14, color="#94a3b8"),
+                    ft.Container(height=10),
+                    ft.Row([txt_inicio, txt_fim], alignment=ft.MainAxisAlignment.CENTER),
+                    chk_combinado,
+                    ft.Button(
+                        "Gerar PDFs",
+                        icon=ft.Icons.PICTURE_AS_PDF,
+                        bgcolor="#ef4444",
+                        color="white",
+                        on_click=lambda _: threading.Thread(target=run_export, daemon=False).start()
+                    ),
+                    progress_bar,
+                    status_text,
+                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=12),
+                padding=ft.Padding(top=20),
+                alignment=ft.Alignment.CENTER
+            )
+        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+
+        self.page.add(content)
+        self.page.update()
+
+    def show_selector(self, data_list=None, streaming=False, on_cancel=None):
+        """Lista de semanas à esquerda e detalhes da semana escolhida à direita.
+
+        Sem `data_list`, as semanas vêm do histórico, em páginas de
+        SELECTOR_PAGE_SIZE carregadas conforme a lista rola. Os detalhes só
+        são montados quando a semana é clicada, e os das últimas
+        DETAIL_CACHE_SIZE semanas ficam guardados para a troca ser imediata.
+
+        Com `streaming`, a tela mostra o progresso de uma extração (e um
+        botão que chama `on_cancel`) e `selector_add_week` acrescenta cada
+        semana que chega.
+        """
+        self.page.controls.clear()
+        
+        # Referências dos inputs (TextFields), uma lista por seção
+        self.input_controls = [] 
+        self.current_data_context = None
+        # chave da semana -> (dados, controles, inputs), do menos para o mais recente
+        self.detail_cache = OrderedDict()
+
+        def entry(week):
+            return (week.key, week.label, week.start.isoformat() if week.start else None)
+
+        if data_list is None:
+            total = self.store.count_weeks()
+            fetch_entries = self.store.week_entries
+            fetch_week = self.store.load_week
+            por_chave, entradas = {}, []
+        else:
+            # Ordenar dados por data
+            weeks = [item if isinstance(item, Week) else Week.from_program(item) for item in data_list]
+            weeks.sort(key=lambda week: week.key, reverse=True)
+            por_chave = {week.key: week for week in weeks}
+            entradas = [entry(week) for week in por_chave.values()]
+            total = len(entradas)
+            fetch_entries = lambda offset, limit: entradas[offset:offset + limit]
+            # As semanas extraídas já foram salvas: do banco elas vêm com os designados
+            fetch_week = lambda key: self.store.load_week(key) or por_chave.get(key)
 
         # --- Elementos de UI ---
         self.detail_container = ft.Column(scroll=ft.ScrollMode.AUTO, expand=True, spacing=10)
@@ -516,105 +746,97 @@ class ProgramApp:
             )
         ]
 
-        # Função para carregar os detalhes e criar os INPUTS
-        def load_details(e, item_data):
-            self.detail_container.controls.clear()
-            self.input_controls = {} # Limpa inputs anteriores
-            
-            meta = item_data.get('metadata', {})
-            secoes = item_data.get('secoes', [])
-            
-            # Guardamos os dados brutos atuais para usar no PDF
-            self.current_data_context = item_data 
-
-            # 1. Cabeçalho
-            header = ft.Container(
-                content=ft.Row([
-                    ft.Column([
-                        ft.Text(f"Semana de {meta.get('data', 'Data N/D')}", size=22, weight=ft.FontWeight.BOLD, color="white"),
-                        ft.Text(f"Leitura: {meta.get('texto_biblico', '')}", size=14, color="#94a3b8"),
-                    ], spacing=2),
-                    ft.ElevatedButton(
-                        "Gerar PDF",
-                        icon=ft.Icons.PICTURE_AS_PDF,
-                        bgcolor="#ef4444",
-                        color="white",
-                        on_click=self.generate_pdf_action
-                    )
-                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                bgcolor="#1e293b", padding=20, border_radius=10
-            )
-            self.detail_container.controls.append(header)
+        def load_details(e, key):
+            cached = self.detail_cache.get(key)
+            if cached is None:
+                item_data = fetch_week(key)
+                if item_data is None:
+                    return
+                cached = (item_data, *self._build_details(item_data))
+                self.detail_cache[key] = cached
+                if len(self.detail_cache) > self.DETAIL_CACHE_SIZE:
+                    self.detail_cache.popitem(last=False)
+            else:
+                self.detail_cache.move_to_end(key)
 
-            # 2. Renderizar Seções com INPUTS
-            for secao in secoes:
-                titulo = secao.get('titulo', '').upper()
-                itens = secao.get('itens', [])
-                
-                # Inicializa lista de controles para esta seção
-                self.input_controls[titulo] = []
-
-                # Lógica de cores/ícones
-                icon = ft.Icons.CIRCLE
-                color_theme = "#94a3b8"
-                if "TESOROS" in titulo or "TESOUROS" in titulo:
-                    icon, color_theme = ft.Icons.DIAMOND, "#a5b4fc"
-                elif "MAESTROS" in titulo or "MINISTÉRIO" in titulo:
-                    icon, color_theme = ft.Icons.WORK, "#fbbf24"
-                elif "VIDA" in titulo or "CRISTIANA" in titulo:
-                    icon, color_theme = ft.Icons.FAVORITE, "#f87171"
-
-                rows_content = []
-                for idx, item_texto in enumerate(itens):
-                    # Criar TextFields para editar
-                    txt_nome = ft.TextField(label="Designado", height=40, text_size=12, expand=True, bgcolor="#0f172a", border_color="#334155")
-                    txt_ajudante = ft.TextField(label="Ajudante/Sala", height=40, text_size=12, width=150, bgcolor="#0f172a", border_color="#334155")
-                    
-                    # Guarda a referência para pegarmos o valor depois
-                    self.input_controls[titulo].append({'nome': txt_nome, 'ajudante': txt_ajudante})
-
-                    # Layout do Item
-                    rows_content.append(
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text(item_texto, color="#e2e8f0", size=14, weight=ft.FontWeight.BOLD),
-                                ft.Row([txt_nome, txt_ajudante])
-                            ], spacing=5),
-                            padding=15,
-                            bgcolor="#1e293b", 
-                            border=ft.Border(left=ft.BorderSide(4, color_theme)),
-                            border_radius=4
-                        )
-                    )
+            # Guardamos a semana atual para usar no PDF
+            self.current_data_context, controls, self.input_controls = cached
+            self.detail_container.controls = controls
+            self.detail_container.update()
 
-                self.detail_container.controls.append(
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Row([ft.Icon(icon, color=color_theme), ft.Text(titulo, size=16, weight=ft.FontWeight.BOLD, color=color_theme)]),
-                            ft.Column(rows_content, spacing=10)
-                        ], spacing=10),
-                        # CORREÇÃO AQUI: Substituído ft.margin.only por ft.Margin
-                        padding=10, 
-                        margin=ft.Margin(0, 0, 0, 10) 
+        # --- Lista Lateral ---
+        date_list_view = ft.ListView(expand=True, spacing=5, padding=10, scroll_interval=100)
+        loading = threading.Lock()
+
+        def load_more():
+            # Eventos de rolagem seguidos não podem carregar a mesma página duas vezes
+            if not loading.acquire(blocking=False):
+                return False
+            try:
+                loaded = len(date_list_view.controls)
+                if loaded >= total:
+                    return False
+                for key, label, start in fetch_entries(loaded, self.SELECTOR_PAGE_SIZE):
+                    # O rótulo do site não traz o ano; ele vem da data da semana
+                    data_str = f"{label} {start[:4]}" if start else label
+                    btn = ft.Container(
+                        content=ft.Row([ft.Icon(ft.Icons.CALENDAR_TODAY, size=16, color="#94a3b8"), ft.Text(data_str, color="white", size=13)]),
+                        padding=15, border_radius=8, bgcolor="#1e293b", ink=True,
+                        on_click=lambda e, key=key: load_details(e, key)
                     )
-                )
+                    date_list_view.controls.append(btn)
+                return True
+            finally:
+                loading.release()
+
+        def on_scroll(e):
+            # Perto do fim da lista, busca a próxima página
+            if e.pixels >= e.max_scroll_extent - 300 and load_more():
+                date_list_view.update()
+
+        date_list_view.on_scroll = on_scroll
+        load_more()
+
+        # --- Extração em andamento ---
+        progress_bar = ft.ProgressBar(width=200, value=0, visible=streaming, color="#6366f1", bgcolor="#1e293b")
+        progress_text = ft.Text("Procurando semanas...", size=13, color="#94a3b8", visible=streaming)
+        cancel_button = ft.TextButton("Cancelar", icon=ft.Icons.CLOSE, visible=streaming and on_cancel is not None,
+                                      on_click=lambda _: on_cancel())
+
+        def add_week(week):
+            nonlocal total
+            key = week.key
+            if key in por_chave:
+                # Semana atualizada: a tela de detalhes dela é montada de novo
+                por_chave[key] = week
+                self.detail_cache.pop(key, None)
+                return
+            por_chave[key] = week
+            entradas.append(entry(week))
+            total += 1
+            if load_more():
+                date_list_view.update()
+
+        def set_progress(feitas, total_paginas):
+            progress_bar.value = feitas / total_paginas if total_paginas else None
+            progress_text.value = f"{feitas} de {total_paginas} página(s)"
+            self.page.update()
 
-            self.detail_container.update()
+        def done(summary=None):
+            # No lugar do progresso fica o resumo do trace da extração
+            progress_bar.visible = False
+            progress_text.value = summary or ""
+            progress_text.visible = bool(summary)
+            cancel_button.visible = False
+            self.page.update()
 
-        # --- Lista Lateral ---
-        date_list_view = ft.ListView(expand=True, spacing=5, padding=10)
-        for item in data_list:
-            data_str = item.get('metadata', {}).get('data', 'Sem data')
-            btn = ft.Container(
-                content=ft.Row([ft.Icon(ft.Icons.CALENDAR_TODAY, size=16, color="#94a3b8"), ft.Text(data_str, color="white", size=13)]),
-                padding=15, border_radius=8, bgcolor="#1e293b", ink=True,
-                on_click=lambda e, i=item: load_details(e, i)
-            )
-            date_list_view.controls.append(btn)
+        self.selector_add_week = add_week
+        self.selector_progress = set_progress
+        self.selector_done = done
 
         # Layout Principal
         layout = ft.Column([
-            ft.Container(content=ft.Row([ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda _: self.show_vida_ministerio(None)), ft.Text("Voltar", size=16, weight=ft.FontWeight.BOLD)]), padding=10),
+            ft.Container(content=ft.Row([ft.IconButton(ft.Icons.ARROW_BACK, on_click=lambda _: self.show_vida_ministerio(None)), ft.Text("Voltar", size=16, weight=ft.FontWeight.BOLD), ft.Container(expand=True), progress_text, progress_bar, cancel_button]), padding=10),
             ft.Container(expand=True, content=ft.Row([
                 ft.Container(content=date_list_view, width=250, bgcolor="#0f172a", border=ft.Border(right=ft.BorderSide(1, "#334155"))),
                 ft.Container(content=self.detail_container, expand=True, padding=20)
@@ -624,27 +846,111 @@ class ProgramApp:
         self.page.add(layout)
         self.page.update()
 
+    def _build_details(self, week):
+        """Monta os controles de edição de uma Week; devolve (controles, inputs por seção)"""
+        controls = []
+        input_controls = []
+
+        # 1. Cabeçalho
+        header = ft.Container(
+            content=ft.Row([
+                ft.Column([
+                    ft.Text(f"Semana de {week.label or 'Data N/D'}", size=22, weight=ft.FontWeight.BOLD, color="white"),
+                    ft.Text(f"Leitura: {week.reading or ''}", size=14, color="#94a3b8"),
+                ], spacing=2),
+                ft.Button(
+                    "Gerar PDF",
+                    icon=ft.Icons.PICTURE_AS_PDF,
+                    bgcolor="#ef4444",
+                    color="white",
+                    on_click=self.generate_pdf_action
+                )
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            bgcolor="#1e293b", padding=20, border_radius=10
+        )
+        controls.append(header)
+
+        # 2. Renderizar Seções com INPUTS
+        for section in week.sections:
+            titulo = section.title.upper()
+
+            # Inicializa lista de controles para esta seção
+            section_inputs = []
+            input_controls.append(section_inputs)
+
+            # Cores/ícones pelo tipo da seção
+            icon, color_theme = self.SECTION_THEMES.get(section.kind, self.DEFAULT_SECTION_THEME)
+            if section.minutes:
+                titulo += f"  ·  {section.minutes} min"
+
+            rows_content = []
+            for part in section.parts:
+                # Criar TextFields para editar
+                # Já vêm com os designados salvos; só as partes editadas são gravadas de novo
+                inputs = {'editado': False}
+                marcar = lambda e, inputs=inputs: inputs.__setitem__('editado', True)
+                txt_nome = ft.TextField(label="Designado", value=part.name, height=40, text_size=12, expand=True, bgcolor="#0f172a", border_color="#334155", on_change=marcar)
+                txt_ajudante = ft.TextField(label="Ajudante/Sala", value=part.helper, height=40, text_size=12, width=150, bgcolor="#0f172a", border_color="#334155", on_change=marcar)
+                
+                # Guarda a referência para pegarmos o valor depois
+                inputs.update(nome=txt_nome, ajudante=txt_ajudante)
+                section_inputs.append(inputs)
+
+                # Layout do Item
+                rows_content.append(
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Text(part.text, color="#e2e8f0", size=14, weight=ft.FontWeight.BOLD),
+                            ft.Row([txt_nome, txt_ajudante])
+                        ], spacing=5),
+                        padding=15,
+                        bgcolor="#1e293b", 
+                        border=ft.Border(left=ft.BorderSide(4, color_theme)),
+                        border_radius=4
+                    )
+                )
+
+            controls.append(
+                ft.Container(
+                    content=ft.Column([
+                        ft.Row([ft.Icon(icon, color=color_theme), ft.Text(titulo, size=16, weight=ft.FontWeight.BOLD, color=color_theme)]),
+                        ft.Column(rows_content, spacing=10)
+                    ], spacing=10),
+                    # CORREÇÃO AQUI: Substituído ft.margin.only por ft.Margin
+                    padding=10, 
+                    margin=ft.Margin(0, 0, 0, 10) 
+                )
+            )
+
+        return controls, input_controls
+
     def generate_pdf_action(self, e):
         """Coleta os dados dos inputs e chama o gerador de PDF"""
         if not hasattr(self, 'current_data_context') or not self.current_data_context:
             return
 
-        pdf_data = self.current_data_context.copy()
+        # Cópia profunda: os dados da semana ficam no cache da tela e não podem mudar
+        pdf_data = copy.deepcopy(self.current_data_context)
         
         # Preenche os dados com o que o usuário digitou nos TextFields
-        for secao in pdf_data['secoes']:
-            titulo = secao.get('titulo', '').upper()
-            if titulo in self.input_controls:
-                for idx, item in enumerate(secao['itens']):
-                    controls = self.input_controls[titulo][idx]
-                    
-                    secao['itens'][idx] = {
-                        'parte': item,
-                        'nome': controls['nome'].value,
-                        'ajudante': controls['ajudante'].value
-                    }
-
-        filename = f"Designacao_{pdf_data['metadata']['data'].replace(' ', '_')}.pdf"
+        editadas = []
+        for position, (section, section_inputs) in enumerate(zip(pdf_data.sections, self.input_controls)):
+            for part_position, (part, controls) in enumerate(zip(section.parts, section_inputs)):
+                part.name = controls['nome'].value or ""
+                part.helper = controls['ajudante'].value or ""
+                if controls['editado']:
+                    editadas.append((position, part_position))
+
+        # Guarda os designados para a exportação em lote; as partes que não
+        # foram tocadas ficam como estão no banco
+        self.store.save_assignments(pdf_data, editadas)
+        for section_inputs in self.input_controls:
+            for controls in section_inputs:
+                controls['editado'] = False
+
+        from pdf_export import week_filename
+
+        filename = week_filename(pdf_data)
         filepath = os.path.join("pdf", filename)
         self.create_pdf_file(filepath, pdf_data)
         
@@ -654,72 +960,9 @@ class ProgramApp:
 
     def create_pdf_file(self, filename, data):
         """Usa ReportLab para desenhar o PDF"""
-        doc = SimpleDocTemplate(filename, pagesize=A4)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # CORREÇÃO: Substituído colors.hexval por colors.HexColor
-        title_style = ParagraphStyle('TitleCustom', parent=styles['Title'], fontSize=18, textColor=colors.HexColor("#2c3e50"), spaceAfter=10)
-        subtitle_style = ParagraphStyle('SubtitleCustom', parent=styles['Normal'], fontSize=12, textColor=colors.gray, spaceAfter=20)
-        # Header style não estava sendo usado explicitamente, mas corrigido igual
-        
-        # Cabeçalho do PDF
-        meta = data['metadata']
-        elements.append(Paragraph(f"Designações: Semana de {meta.get('data', '')}", title_style))
-        elements.append(Paragraph(f"Leitura: {meta.get('texto_biblico', '')} | {meta.get('introducao', '')}", subtitle_style))
-        elements.append(Spacer(1, 10))
-
-        # Loop pelas seções
-        for secao in data['secoes']:
-            titulo = secao.get('titulo', '')
-            
-            # CORREÇÃO: Cores com HexColor
-            bg_color = colors.HexColor("#7f8c8d")
-            if "TESOROS" in titulo.upper(): bg_color = colors.HexColor("#6c5ce7")
-            elif "MAESTROS" in titulo.upper(): bg_color = colors.HexColor("#f1c40f")
-            elif "VIDA" in titulo.upper(): bg_color = colors.HexColor("#e74c3c")
-
-            section_title = ParagraphStyle('SecTitle', parent=styles['Heading2'], fontSize=12, textColor=colors.white, backColor=bg_color, borderPadding=5, spaceAfter=5)
-            elements.append(Paragraph(titulo, section_title))
-
-            # Tabela de Designações
-            table_data = []
-            table_data.append(["Parte", "Designado / Ajudante"])
-
-            for item in secao['itens']:
-                parte_txt = item.get('parte', '')
-                nome = item.get('nome', '')
-                ajudante = item.get('ajudante', '')
-                
-                full_name = nome
-                if ajudante:
-                    full_name += f" / {ajudante}"
-                
-                if not full_name.strip():
-                    full_name = "__________________________"
-
-                p_parte = Paragraph(parte_txt, styles['Normal'])
-                p_nome = Paragraph(f"<b>{full_name}</b>", styles['Normal'])
-                
-                table_data.append([p_parte, p_nome])
-
-            t = Table(table_data, colWidths=[300, 180])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]))
-            elements.append(t)
-            elements.append(Spacer(1, 15))
-
-        if 'conclusao' in data:
-            elements.append(Paragraph(f"<b>Conclusão:</b> {data['conclusao']}", subtitle_style))
-
-        doc.build(elements)
+        # ReportLab só é importado quando o primeiro PDF é gerado
+        from pdf_export import create_pdf_file
+        create_pdf_file(filename, data)
 
 def main(page: ft.Page):
     app = ProgramApp(page)
@@ -0,0 +1,220 @@
+# Bibliotecas para PDF
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import multiprocessing
+import os
+
+
+def create_pdf_file(filename, week):
+    """Usa ReportLab para desenhar o PDF de uma Week"""
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    doc.build(week_elements(week))
+
+
+def create_combined_pdf(filename, weeks):
+    """Um único PDF com uma semana por página (ou mais, se não couber)"""
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    elements = []
+    for index, week in enumerate(weeks):
+        if index:
+            elements.append(PageBreak())
+        elements.extend(week_elements(week))
+    doc.build(elements)
+    return filename
+
+
+class PdfTheme:
+    """Estilos do PDF, montados uma única vez por processo (ver `get_theme`).
+
+    Guarda os estilos de parágrafo (um por cor de seção), o estilo das
+    tabelas e o resultado do parse de cada texto já usado: o mesmo texto
+    com o mesmo estilo não passa de novo pelo parser do ReportLab.
+    """
+
+    DEFAULT_SECTION_COLOR = "#7f8c8d"
+    # Section.kind -> cor
+    SECTION_COLORS = {
+        "tesoros": "#6c5ce7",
+        "maestros": "#f1c40f",
+        "vida": "#e74c3c",
+    }
+    MAX_CACHED_TEXTS = 4096
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.normal = styles['Normal']
+        self._heading2 = styles['Heading2']
+
+        # CORREÇÃO: Substituído colors.hexval por colors.HexColor
+        self.title = ParagraphStyle('TitleCustom', parent=styles['Title'], fontSize=18, textColor=colors.HexColor("#2c3e50"), spaceAfter=10)
+        self.subtitle = ParagraphStyle('SubtitleCustom', parent=styles['Normal'], fontSize=12, textColor=colors.gray, spaceAfter=20)
+
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ])
+
+        self._section_styles = {}
+        self._frags = {}
+
+    def section_style(self, kind):
+        """Estilo do título da seção, com a cor de fundo do tipo dela"""
+        color = self.SECTION_COLORS.get(kind, self.DEFAULT_SECTION_COLOR)
+
+        style = self._section_styles.get(color)
+        if style is None:
+            style = ParagraphStyle(f'SecTitle{color}', parent=self._heading2, fontSize=12, textColor=colors.white, backColor=colors.HexColor(color), borderPadding=5, spaceAfter=5)
+            self._section_styles[color] = style
+        return style
+
+    def paragraph(self, text, style):
+        key = (style.name, text)
+        frags = self._frags.get(key)
+        if frags is None:
+            paragraph = Paragraph(text, style)
+            if len(self._frags) >= self.MAX_CACHED_TEXTS:
+                self._frags.clear()
+            self._frags[key] = paragraph.frags
+            return paragraph
+        return Paragraph(text, style, frags=list(frags))
+
+
+@lru_cache(maxsize=None)
+def get_theme():
+    return PdfTheme()
+
+
+def week_elements(week):
+    """Elementos (flowables) do ReportLab de uma Week"""
+    theme = get_theme()
+    elements = []
+
+    # Cabeçalho do PDF
+    elements.append(theme.paragraph(f"Designações: Semana de {week.label}", theme.title))
+    elements.append(theme.paragraph(f"Leitura: {week.reading or ''} | {week.introduction or ''}", theme.subtitle))
+    elements.append(Spacer(1, 10))
+
+    # Loop pelas seções
+    for section in week.sections:
+        elements.append(theme.paragraph(section.title, theme.section_style(section.kind)))
+
+        # Tabela de Designações
+        table_data = []
+        table_data.append(["Parte", "Designado / Ajudante"])
+
+        for part in section.parts:
+            full_name = part.name
+            if part.helper:
+                full_name += f" / {part.helper}"
+            
+            if not full_name.strip():
+                full_name = "__________________________"
+
+            p_parte = theme.paragraph(part.text, theme.normal)
+            p_nome = theme.paragraph(f"<b>{full_name}</b>", theme.normal)
+            
+            table_data.append([p_parte, p_nome])
+
+        t = Table(table_data, colWidths=[300, 180])
+        t.setStyle(theme.table_style)
+        elements.append(t)
+        elements.append(Spacer(1, 15))
+
+    elements.append(theme.paragraph(f"<b>Conclusão:</b> {week.conclusion}", theme.subtitle))
+
+    return elements
+
+
+def _week_slug(week):
+    # O rótulo não tem ano: "2-8 DE SEPTIEMBRE" existe em 2019 e em 2024
+    label = week.label.replace(' ', '_')
+    return f"{week.start.isoformat()}_{label}" if week.start else label
+
+
+def week_filename(week):
+    return f"Designacao_{_week_slug(week)}.pdf"
+
+
+def _render_week(directory, week, filename):
+    # Roda nos processos do pool, por isso fica no nível do módulo
+    filepath = os.path.join(directory, filename)
+    create_pdf_file(filepath, week)
+    return filepath
+
+
+def _unique_filenames(weeks):
+    """(semana, nome do arquivo) sem dois processos escrevendo no mesmo arquivo.
+
+    A mesma semana pedida duas vezes sai uma vez só; semanas diferentes que
+    dariam o mesmo nome (rótulos sem data) ganham um sufixo.
+    """
+    keys = {}
+    jobs = []
+    for week in weeks:
+        filename = week_filename(week)
+        if keys.get(filename) == week.key:
+            continue
+
+        base, suffix = filename[:-len(".pdf")], 2
+        while filename in keys:
+            filename = f"{base}_{suffix}.pdf"
+            suffix += 1
+        keys[filename] = week.key
+        jobs.append((week, filename))
+    return jobs
+
+
+def export_weeks(weeks, directory="pdf", combined=False, workers=None, on_progress=None):
+    """Gera os PDFs de várias semanas (Week) em um pool de processos.
+
+    Sem `combined`, sai um arquivo por semana, desenhados em paralelo; com
+    `combined`, um único arquivo com todas as semanas, nessa ordem.
+    `on_progress(feitos, total)` é chamado a cada arquivo pronto. Devolve os
+    caminhos gerados.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if not weeks:
+        return []
+
+    # O app roda com várias threads (Flet, asyncio): fork copiaria o processo
+    # no meio delas, então os processos do pool começam do zero
+    mp_context = multiprocessing.get_context("spawn")
+
+    if combined:
+        first = _week_slug(weeks[0])
+        last = _week_slug(weeks[-1])
+        filepath = os.path.join(directory, f"Designacoes_{first}_a_{last}.pdf")
+        # Um documento só não se divide entre processos; o pool só tira o
+        # trabalho do processo da interface
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+            executor.submit(create_combined_pdf, filepath, weeks).result()
+        if on_progress:
+            on_progress(1, 1)
+        return [filepath]
+
+    paths = []
+    jobs = _unique_filenames(weeks)
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        futures = [
+            executor.submit(_render_week, directory, week, filename)
+            for week, filename in jobs
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                paths.append(future.result())
+            except Exception as e:
+                print(f"Erro ao gerar PDF: {e}")
+            if on_progress:
+                on_progress(done, len(jobs))
+
+    return sorted(paths)
@@ -0,0 +1,396 @@
+from datetime import date
+from scrapper.data_handling import process_data
+from scrapper.headings import HEADINGS_JS
+from scrapper.http_fetcher import AsyncHttpFetcher
+from scrapper.jobs import JobCancelled, check_cancelled
+from scrapper.rate_control import AsyncFetchScheduler
+from scrapper.readiness import AsyncPageReadiness, ReadyStage
+from scrapper.request_blocking import ResourceBlocker
+from scrapper.web_scrapper import (
+    CARDS_JS, HOME_URL, MONTH_CARDS, READY_STAGES, TODAY_CARDS, YEAR_CARDS,
+    ScrapperBase,
+)
+from scrapper.week_calendar import month_index_url
+from scrapper import tracing
+import asyncio
+
+
+class AsyncDataScrapper(ScrapperBase):
+    """O DataScrapper sobre asyncio e a API assíncrona do Playwright.
+
+    Tem os mesmos `extract_this_week`, `extract_this_month` e
+    `extract_all_available_weeks`, só que como corrotinas: rodam no loop de
+    eventos de quem chama (no app, o do Flet, via `page.run_task`), sem uma
+    thread por extração. Quantas páginas ficam em andamento é o limite do
+    scheduler; abas do navegador são no máximo `concurrency`.
+
+    Deve ser usado sempre a partir do mesmo loop de eventos.
+    """
+
+    readiness_class = AsyncPageReadiness
+    scheduler_class = AsyncFetchScheduler
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        navigation_timeout: float = 30,
+        headless: bool = True,
+        block_resources: bool = True,
+        use_http: bool = True,
+        measure_readiness: bool = False,
+        max_concurrency: int | None = None,
+    ):
+        super().__init__(
+            concurrency, navigation_timeout, headless, block_resources,
+            use_http, measure_readiness, max_concurrency,
+        )
+        self.http = AsyncHttpFetcher(
+            max_connections=self.max_concurrency,
+            cache=self.cache,
+            ttl_policy=self._cache_ttl,
+        )
+
+        # Um navegador e um contexto, abertos no primeiro uso; cada página é uma aba
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._browser_lock = asyncio.Lock()
+        self._tabs = asyncio.Semaphore(self.concurrency)
+
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._context
+
+            # Importado aqui: extrações que ficam só no HTTP não carregam o Playwright
+            from playwright.async_api import async_playwright
+
+            await self._close_browser()
+            launch_options, context_options = self._launch_options()
+            with tracing.span("browser_launch"):
+                self._playwright = await async_playwright().start()
+                try:
+                    self._browser = await self._playwright.chromium.launch(**launch_options)
+                except Exception:
+                    self._browser = await self._playwright.firefox.launch(**launch_options)
+                self._context = await self._browser.new_context(**context_options)
+
+            blocker = ResourceBlocker(
+                block=self.block_resources, sizes=self.resource_sizes
+            )
+            await blocker.install_async(self._context)
+            self._blockers[self._context] = blocker
+            return self._context
+
+    async def warm_up(self):
+        """Abre o navegador antes da primeira extração que precisar dele."""
+        try:
+            await self._ensure_browser()
+        except Exception as e:
+            print(f"Erro ao abrir o navegador: {e}")
+
+    async def _close_browser(self):
+        for closer in (
+            self._context and self._context.close,
+            self._browser and self._browser.close,
+            self._playwright and self._playwright.stop,
+        ):
+            if closer is None:
+                continue
+            try:
+                await closer()
+            except Exception:
+                pass
+        self._playwright = self._browser = self._context = None
+
+    async def close(self):
+        """Fecha o navegador e as conexões HTTP. Chamado uma vez, ao sair do app."""
+        await self._close_browser()
+        await self.http.close()
+
+    async def _with_page(self, job):
+        """`await job(aba)` em uma aba nova do navegador, fechada no final."""
+        async with self._tabs:
+            context = await self._ensure_browser()
+            page = await context.new_page()
+            try:
+                return await job(page)
+            finally:
+                self._take_resources(page, None)
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    @staticmethod
+    async def scrape_data(page) -> list[str]:
+        return [text.strip() for text in await page.evaluate(HEADINGS_JS)]
+
+    async def _http_get(self, url: str) -> str:
+        async def get():
+            with tracing.span("http_get", url):
+                return await self.http.get_html(url)
+
+        return await self.scheduler.call(url, get)
+
+    async def _discover_cards(self, url: str, selector: str, reference: date | None = None) -> list[tuple[str, str]]:
+        """Como `DataScrapper._discover_cards`: HTML cru primeiro, navegador se não houver cards."""
+        check_cancelled()
+        reference = reference or date.today()
+        cards = None
+        if self.use_http:
+            try:
+                html = await self._http_get(url)
+                with tracing.span("parse_cards", url):
+                    cards = self._parse_cards(html, selector)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                print(f"HTTP falhou para {url}, usando o navegador: {e}")
+
+        if not cards:
+            cards = await self.scheduler.call(
+                url, lambda: self._with_page(lambda page: self._browser_cards(page, url, selector))
+            )
+            self._report_readiness()
+
+        self._remember_cards(cards, reference)
+        return cards
+
+    async def _browser_cards(self, page, url: str, selector: str) -> list[tuple[str, str]]:
+        stage = next(
+            (s for s in READY_STAGES.values() if s.selector == selector),
+            ReadyStage("cards", selector, timeout=15),
+        )
+        await self.readiness.goto(page, url, stage)
+
+        with tracing.span("read_cards", url):
+            return [
+                (text, href)
+                for text, href in await page.locator(selector).evaluate_all(CARDS_JS)
+                if href
+            ]
+
+    async def _http_week(self, url: str) -> list[str] | None:
+        """Cabeçalhos da semana via HTTP, ou None se o resultado não for válido."""
+        check_cancelled()
+        try:
+            html = await self._http_get(url)
+            with tracing.span("parse_headings", url):
+                data = self.extract_headings(html)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"HTTP falhou para {url}: {e}")
+            return None
+
+        return data if process_data(data) else None
+
+    async def _browser_week(self, page, url: str) -> tuple[list[str], dict]:
+        await self.readiness.goto(page, url, READY_STAGES["week"])
+        with tracing.span("read_headings", url):
+            data = await self.scrape_data(page)
+        return data, self._take_resources(page, url)
+
+    async def _fetch_weeks(self, urls, on_ready=None, on_failed=None) -> list[list[str] | None]:
+        """Cabeçalhos de cada semana, na mesma ordem de `urls`.
+
+        Cada semana tenta o HTTP e, se o HTML não servir, abre uma aba; o
+        scheduler limita quantas ficam em andamento e repete as que falham.
+        `on_ready(indice, cabeçalhos)` é chamado assim que cada uma fica
+        pronta; as que desistem ficam como None e vão para `on_failed(indice,
+        erro)`, sem parar as outras.
+        """
+        results = [None] * len(urls)
+        report = [None] * len(urls)
+
+        async def fetch(indice, url):
+            check_cancelled()
+            try:
+                data = await self._http_week(url) if self.use_http else None
+                if data is None:
+                    data, report[indice] = await self.scheduler.call(
+                        url, lambda: self._with_page(lambda page: self._browser_week(page, url))
+                    )
+            except JobCancelled:
+                raise
+            except Exception as e:
+                if on_failed is not None:
+                    on_failed(indice, e)
+                return
+            results[indice] = data
+            if on_ready is not None:
+                on_ready(indice, data)
+
+        tasks = [asyncio.ensure_future(fetch(i, url)) for i, url in enumerate(urls)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # O cancelamento do job encerra as semanas que faltam
+            for task in tasks:
+                task.cancel()
+
+        if any(r is not None for r in report):
+            self._report_resources(report)
+            self._report_readiness()
+        return results
+
+    async def _extract_weeks(self, urls, on_week=None, on_progress=None) -> list[dict]:
+        """Baixa as semanas de `urls` e devolve os programas já processados.
+
+        `on_week` recebe as semanas na ordem de `urls`: uma que chega antes
+        das anteriores espera por elas.
+        """
+        feitas = 0
+        failed = []
+        # índice -> cabeçalhos (None se desistiu) das que esperam as anteriores
+        prontas = {}
+        proxima = 0
+        if on_progress is not None:
+            on_progress(0, len(urls))
+
+        def entregar():
+            nonlocal proxima
+            while proxima in prontas:
+                data = prontas.pop(proxima)
+                if data is not None:
+                    with tracing.span("process_data", urls[proxima]):
+                        programs = process_data(data)
+                    for program in programs:
+                        on_week(program)
+                proxima += 1
+
+        def ready(indice, data):
+            nonlocal feitas
+            check_cancelled()
+            feitas += 1
+            if on_week is not None:
+                prontas[indice] = data
+                entregar()
+            if on_progress is not None:
+                on_progress(feitas, len(urls))
+
+        def week_failed(indice, error):
+            nonlocal feitas
+            feitas += 1
+            failed.append((urls[indice], error))
+            if on_week is not None:
+                prontas[indice] = None
+                entregar()
+            if on_progress is not None:
+                on_progress(feitas, len(urls))
+
+        data = await self._fetch_weeks(urls, ready, week_failed)
+        self._report_failed(failed)
+        with tracing.span("process_data"):
+            return process_data([d for d in data if d is not None])
+
+    async def _this_month_links(self, known_weeks=None) -> list[str]:
+        today = date.today()
+        cards = await self._discover_cards(month_index_url(today.year, today.month), MONTH_CARDS)
+        return self._links_from_current_week(cards, known_weeks)
+
+    async def extract_this_week(self, on_week=None, on_progress=None) -> list[dict]:
+        try:
+            data = None
+            if on_progress is not None:
+                on_progress(0, 1)
+
+            if self.use_http:
+                url = self.week_index.get(date.today())
+                if url is not None:
+                    data = await self._http_week(url)
+                if data is None:
+                    links = await self._this_month_links()
+                    if links:
+                        data = await self._http_week(links[0])
+
+            if data is None:
+                data = await self.scheduler.call(
+                    HOME_URL, lambda: self._with_page(self._extract_this_week)
+                )
+                self._report_readiness()
+
+            with tracing.span("process_data"):
+                programs = process_data(data)
+            if on_week is not None:
+                for program in programs:
+                    on_week(program)
+            if on_progress is not None:
+                on_progress(1, 1)
+
+            self._write_json("programa_da_semana.json", programs)
+            return programs
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"Erro em extract_this_week: {e}")
+            return []
+
+    async def _extract_this_week(self, page) -> list[str]:
+        await self.readiness.goto(page, HOME_URL, READY_STAGES["home"])
+        check_cancelled()
+
+        await page.click("#menuToday")
+        await self.readiness.wait(page, READY_STAGES["today"])
+        check_cancelled()
+
+        current_week = self.get_week_extremes()
+        week_stage = READY_STAGES["week"]
+        await self.readiness.forget(page, week_stage)
+
+        cards = await page.locator(TODAY_CARDS).evaluate_all(CARDS_JS)
+        for i, (text, _) in enumerate(cards):
+            if current_week in self._normalize(text):
+                await page.locator(TODAY_CARDS).nth(i).click()
+                await self.readiness.wait(page, week_stage)
+                break
+
+        with tracing.span("read_headings"):
+            return await self.scrape_data(page)
+
+    async def extract_this_month(self, known_weeks=None, on_week=None, on_progress=None) -> list[dict]:
+        try:
+            programs = await self._extract_weeks(
+                await self._this_month_links(known_weeks), on_week, on_progress
+            )
+            self._write_json("programa_do_mes_atual.json", programs)
+            return programs
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"Erro em extract_this_month: {e}")
+            return []
+
+    async def extract_all_available_weeks(self, known_weeks=None, on_week=None, on_progress=None) -> list[dict]:
+        try:
+            cards = await self._discover_cards(self.year_index_url(date.today().year), YEAR_CARDS)
+            month_urls = [self._absolute_url(href) for _, href in cards]
+
+            # Os índices dos meses são lidos juntos, na ordem dos meses; um mês
+            # que não abre não derruba os outros
+            async def month(url):
+                try:
+                    return await self._discover_cards(url, MONTH_CARDS)
+                except JobCancelled:
+                    raise
+                except Exception as e:
+                    print(f"Índice do mês não lido: {url} ({e})")
+                    return []
+
+            month_cards = await asyncio.gather(*(month(url) for url in month_urls))
+            week_cards = [card for month in month_cards for card in month]
+
+            programs = await self._extract_weeks(
+                self._links_from_current_week(week_cards, known_weeks), on_week, on_progress
+            )
+            self._write_json("programa_de_todas_as_semanas_disponiveis.json", programs)
+            return programs
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"Erro em extract_all_available_weeks: {e}")
+            return []
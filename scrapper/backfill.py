@@ -0,0 +1,156 @@
+from contextlib import closing
+from datetime import date
+from scrapper.data_handling import MESES, process_data
+from scrapper.jobs import JobCancelled, check_cancelled
+from scrapper.web_scrapper import MONTH_CARDS, YEAR_CARDS
+import json
+import os
+
+
+class ArchiveBackfill:
+    """Monta o arquivo local com as programações de vários anos.
+
+    O progresso fica em um checkpoint JSON: os meses descobertos em cada ano,
+    os cards (texto e href) das semanas de cada mês e as semanas já gravadas. Depois de uma queda ou
+    reinício, `run` continua de onde parou e só baixa o que falta. Cada semana
+    vai para o `store` assim que é processada.
+    """
+
+    # De quantas em quantas páginas gravadas o checkpoint vai para o disco
+    SAVE_EVERY = 20
+
+    def __init__(self, scrapper, store, checkpoint_path=None):
+        self.scrapper = scrapper
+        self.store = store
+        self.checkpoint_path = checkpoint_path or os.path.join(
+            scrapper.json_dir, "backfill_checkpoint.json"
+        )
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> dict:
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            checkpoint = {}
+
+        checkpoint.setdefault("years", {})
+        checkpoint.setdefault("months", {})
+        checkpoint.setdefault("done", [])
+        checkpoint.setdefault("failed", {})
+        return checkpoint
+
+    def _save_checkpoint(self):
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @staticmethod
+    def _month_reference(year: int, text: str) -> str:
+        """Data no começo do mês do card, para achar o ano dos rótulos das semanas."""
+        text = text.lower()
+        months = [n for n, nome in MESES.items() if nome.lower() in text]
+        return date(year, min(months) if months else 1, 15).isoformat()
+
+    def _discover(self, year: int) -> list[tuple[str, str]]:
+        """(url, data de referência) de todas as semanas do ano."""
+        year_key = str(year)
+        if year_key not in self.checkpoint["years"]:
+            cards = self.scrapper._discover_cards(
+                self.scrapper.year_index_url(year), YEAR_CARDS
+            )
+            self.checkpoint["years"][year_key] = [
+                [self.scrapper._absolute_url(href), self._month_reference(year, text)]
+                for text, href in cards
+            ]
+            self._save_checkpoint()
+
+        weeks = []
+        for month_url, reference in self.checkpoint["years"][year_key]:
+            if month_url in self.checkpoint["months"]:
+                # Retomada: os cards vêm do checkpoint, mas o scraper ainda
+                # precisa deles para o TTL de cada semana no cache
+                cards = self.checkpoint["months"][month_url]
+                self.scrapper._remember_cards(cards, date.fromisoformat(reference))
+            else:
+                cards = self.scrapper._discover_cards(
+                    month_url, MONTH_CARDS, date.fromisoformat(reference)
+                )
+                self.checkpoint["months"][month_url] = [
+                    [text, href] for text, href in cards
+                ]
+                self._save_checkpoint()
+
+            weeks.extend(
+                (self.scrapper._absolute_url(href), reference) for _, href in cards
+            )
+        return weeks
+
+    def run(self, first_year: int, last_year: int, on_week=None) -> dict:
+        """Baixa as semanas de `first_year` a `last_year` que ainda não foram gravadas.
+
+        `on_week(program)` é chamado para cada semana gravada. As páginas
+        passam todas pelo `_iter_weeks` do scraper, que limita quantas ficam
+        em andamento; se o job for cancelado (ou com Ctrl-C), só as que já
+        estavam baixando são esperadas e o checkpoint é gravado antes de sair.
+        """
+        done = set(self.checkpoint["done"])
+        pending = []
+        for year in range(first_year, last_year + 1):
+            try:
+                pending.extend(
+                    (url, ref) for url, ref in self._discover(year) if url not in done
+                )
+            except JobCancelled:
+                raise
+            except Exception as e:
+                print(f"Erro ao descobrir as semanas de {year}: {e}")
+
+        urls = [url for url, _ in pending]
+        saved = 0
+        unsaved = 0
+
+        def page_failed(indice, error):
+            nonlocal unsaved
+            print(f"Erro ao baixar {urls[indice]}: {error}")
+            self.checkpoint["failed"][urls[indice]] = str(error)
+            unsaved += 1
+
+        try:
+            with closing(self.scrapper._iter_weeks(urls, page_failed)) as weeks:
+                for indice, data in weeks:
+                    check_cancelled()
+                    url, reference = pending[indice]
+                    try:
+                        programs = process_data(data)
+                        self.store.save_weeks(
+                            programs, reference=date.fromisoformat(reference)
+                        )
+                    except JobCancelled:
+                        raise
+                    except Exception as e:
+                        print(f"Erro ao gravar {url}: {e}")
+                        self.checkpoint["failed"][url] = str(e)
+                        unsaved += 1
+                        continue
+
+                    self.checkpoint["done"].append(url)
+                    self.checkpoint["failed"].pop(url, None)
+                    saved += len(programs)
+                    unsaved += 1
+                    if unsaved >= self.SAVE_EVERY:
+                        self._save_checkpoint()
+                        unsaved = 0
+
+                    if on_week is not None:
+                        for program in programs:
+                            on_week(program)
+        finally:
+            self._save_checkpoint()
+
+        return {
+            "weeks_saved": saved,
+            "pages_pending": len(pending),
+            "pages_failed": len(self.checkpoint["failed"]),
+        }
@@ -0,0 +1,175 @@
+from concurrent.futures import Future
+from scrapper.jobs import propagate_context
+import queue
+import threading
+
+
+class BrowserSession:
+    """Navegador + contexto que ficam abertos entre uma extração e outra.
+
+    Os objetos da API síncrona do Playwright só podem ser usados pela thread
+    que os criou, então cada sessão tem a sua própria thread e todo trabalho
+    com o navegador é enviado para ela.
+    """
+
+    def __init__(self, launcher, name: str):
+        self.launcher = launcher
+        self.playwright = None
+        self.browser = None
+        self.context = None
+
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                break
+
+            fn, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def call(self, fn, *args) -> Future:
+        future = Future()
+        self._jobs.put((lambda: fn(*args), future))
+        return future
+
+    # Os métodos abaixo rodam sempre na thread da sessão
+
+    def _is_healthy(self) -> bool:
+        if self.browser is None or self.context is None:
+            return False
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+    def _ensure_started(self):
+        if self._is_healthy():
+            return
+
+        # Importado aqui: extrações que ficam só no HTTP não carregam o Playwright
+        from playwright.sync_api import sync_playwright
+
+        # Navegador caiu ou nunca foi aberto: descarta o que sobrou e abre outro
+        self._stop()
+        self.playwright = sync_playwright().start()
+        self.browser, self.context = self.launcher(self.playwright)
+
+    def _run(self, job):
+        self._ensure_started()
+
+        page = self.context.new_page()
+        try:
+            return job(page)
+        finally:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def _stop(self):
+        for closer in (
+            lambda: self.context.close(),
+            lambda: self.browser.close(),
+            lambda: self.playwright.stop(),
+        ):
+            try:
+                closer()
+            except Exception:
+                pass
+
+        self.playwright = None
+        self.browser = None
+        self.context = None
+
+    def close(self):
+        try:
+            self.call(self._stop).result()
+        finally:
+            self._jobs.put(None)
+            self._thread.join()
+
+
+class BrowserPool:
+    """Conjunto de sessões de navegador reaproveitadas entre as extrações.
+
+    Cada chamada a `run` pega uma sessão livre (abrindo uma nova enquanto o
+    limite `size` não foi atingido), verifica se o navegador ainda responde e
+    executa o trabalho em uma aba nova. O pool só é fechado uma vez, em
+    `close`, quando o aplicativo termina.
+    """
+
+    def __init__(self, launcher, size: int = 2):
+        self.launcher = launcher
+        self.size = max(1, size)
+
+        # LIFO para reaproveitar primeiro a sessão usada mais recentemente
+        self._idle = queue.LifoQueue()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_session(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("O pool de navegadores já foi fechado")
+            if len(self._sessions) >= self.size:
+                return None
+
+            session = BrowserSession(
+                self.launcher, name=f"browser-session-{len(self._sessions) + 1}"
+            )
+            self._sessions.append(session)
+            return session
+
+    def _checkout(self) -> BrowserSession:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        session = self._new_session()
+        if session is None:
+            session = self._idle.get()
+        return session
+
+    def run(self, job):
+        """Executa `job(page)` em uma sessão livre e devolve o resultado."""
+        session = self._checkout()
+        try:
+            # O job atual (e o seu cancelamento) acompanha o trabalho até a sessão
+            return session.call(propagate_context(session._run), job).result()
+        finally:
+            self._idle.put(session)
+
+    def warm_up(self):
+        """Abre um navegador em segundo plano para a próxima extração."""
+        if self._idle.qsize() or len(self._sessions) >= self.size:
+            return
+
+        session = self._new_session()
+        if session is not None:
+            session.call(session._ensure_started)
+            self._idle.put(session)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            sessions = list(self._sessions)
+
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
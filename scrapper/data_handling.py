@@ -1,3 +1,59 @@
+from datetime import date, datetime
+import re
+
+
+MESES = {
+    1: "ENERO", 2: "FEBRERO", 3: "MARZO", 4: "ABRIL",
+    5: "MAYO", 6: "JUNIO", 7: "JULIO", 8: "AGOSTO",
+    9: "SEPTIEMBRE", 10: "OCTUBRE", 11: "NOVIEMBRE", 12: "DICIEMBRE",
+}
+
+# "3-9 de marzo" ou "28 de abril a 4 de mayo"
+WEEK_LABEL_RE = re.compile(r"(\d{1,2})(?: de ([a-z]+))?(?:-| a )(\d{1,2}) de ([a-z]+)")
+
+
+def parse_week_range(label: str, reference: date | None = None) -> tuple[date, date] | None:
+    """Segunda e domingo de um rótulo como "3-9 DE MARZO", ou None.
+
+    O rótulo não traz o ano, então fica o ano que deixa a semana mais
+    próxima de `reference` (hoje, por padrão).
+    """
+    match = WEEK_LABEL_RE.search(" ".join(label.split()).lower())
+    if not match:
+        return None
+
+    months = {nome.lower(): numero for numero, nome in MESES.items()}
+    end_month = months.get(match.group(4))
+    start_month = months.get(match.group(2) or match.group(4))
+    if end_month is None or start_month is None:
+        return None
+
+    reference = reference or datetime.now().date()
+    candidates = []
+    for year in (reference.year - 1, reference.year, reference.year + 1):
+        try:
+            end = date(year, end_month, int(match.group(3)))
+            start_year = year - 1 if start_month > end_month else year
+            start = date(start_year, start_month, int(match.group(1)))
+        except ValueError:
+            continue
+        candidates.append((start, end))
+
+    if not candidates:
+        return None
+    return min(candidates, key=lambda c: abs((c[1] - reference).days))
+
+
+def week_key(label: str, start: date | None = None) -> str:
+    """Chave de uma semana no histórico: a segunda-feira (ISO) ou, sem data, o rótulo.
+
+    O rótulo sozinho não serve: "2-8 DE SEPTIEMBRE" existe em 2019 e em 2024.
+    """
+    if start is not None:
+        return start.isoformat()
+    return " ".join(label.split()).lower()
+
+
 def process_data(input_data) -> list[dict]:
     if not input_data:
         return []
@@ -56,3 +112,177 @@ def process_data(input_data) -> list[dict]:
         final_programs.append(programa)
 
     return final_programs
+
+
+# Seção da reunião -> palavras do título que a identificam (espanhol e português)
+SECTION_KINDS = [
+    ("tesoros", ("TESOROS", "TESOUROS")),
+    ("maestros", ("MAESTROS", "MINISTÉRIO")),
+    ("vida", ("VIDA", "CRISTIANA")),
+]
+
+# "3. Lectura de la Biblia (4 mins.) Isa. 1:1-9"
+PART_NUMBER_RE = re.compile(r"^(\d+)\.\s*")
+PART_MINUTES_RE = re.compile(r"\((\d+)\s*mins?\.?\)")
+
+
+def section_kind(titulo: str) -> str | None:
+    """"tesoros", "maestros" ou "vida" para o título de uma seção, ou None."""
+    titulo = titulo.upper()
+    for kind, palavras in SECTION_KINDS:
+        if any(palavra in titulo for palavra in palavras):
+            return kind
+    return None
+
+
+class Part:
+    """Uma parte da reunião, com número, título e duração já separados do texto.
+
+    `name` e `helper` são os designados, preenchidos na tela de edição.
+    """
+
+    __slots__ = ("text", "number", "title", "minutes", "name", "helper")
+
+    def __init__(self, text: str, number: int | None = None, title: str = "",
+                 minutes: int | None = None, name: str = "", helper: str = ""):
+        self.text = text
+        self.number = number
+        self.title = title
+        self.minutes = minutes
+        self.name = name
+        self.helper = helper
+
+    @classmethod
+    def parse(cls, text: str, name: str = "", helper: str = "") -> "Part":
+        number = None
+        rest = text
+        match = PART_NUMBER_RE.match(text)
+        if match:
+            number = int(match.group(1))
+            rest = text[match.end():]
+
+        minutes = None
+        match = PART_MINUTES_RE.search(rest)
+        if match:
+            minutes = int(match.group(1))
+            rest = rest[:match.start()]
+
+        return cls(text, number, rest.strip(), minutes, name or "", helper or "")
+
+    def to_compact(self) -> list:
+        """[texto, número, minutos, início, fim do título no texto, designados...]
+
+        Uma parte sem nada além do texto (um cântico) vira só [texto].
+        """
+        names = [self.name, self.helper] if self.name or self.helper else []
+        if self.number is None and self.minutes is None and self.title == self.text:
+            return [self.text, *names] if names else [self.text]
+
+        # O título é um trecho do texto: vão só as posições dele
+        start = self.text.find(self.title)
+        title = [start, start + len(self.title)] if start >= 0 else [self.title]
+        return [self.text, self.number, self.minutes, *title, *names]
+
+    @classmethod
+    def from_compact(cls, data) -> "Part":
+        text = data[0]
+        if len(data) <= 3:
+            return cls(text, None, text, None, *data[1:])
+        if isinstance(data[3], str):
+            _, number, minutes, title, *names = data
+        else:
+            _, number, minutes, start, end, *names = data
+            title = text[start:end]
+        return cls(text, number, title, minutes, *names)
+
+
+class Section:
+    """Uma seção da reunião e o tipo dela (ver `section_kind`)."""
+
+    __slots__ = ("title", "kind", "parts")
+
+    def __init__(self, title: str, kind: str | None, parts: list[Part]):
+        self.title = title
+        self.kind = kind
+        self.parts = parts
+
+    @property
+    def minutes(self) -> int:
+        return sum(part.minutes or 0 for part in self.parts)
+
+    def to_compact(self) -> list:
+        return [self.title, self.kind, [part.to_compact() for part in self.parts]]
+
+    @classmethod
+    def from_compact(cls, data) -> "Section":
+        title, kind, parts = data
+        return cls(title, kind, [Part.from_compact(part) for part in parts])
+
+
+class Week:
+    """Uma semana da programação, lida uma vez a partir do formato de `process_data`.
+
+    A tela e o PDF usam os campos já separados (tipo da seção, número,
+    título e minutos de cada parte) sem voltar ao texto. `start` é a
+    segunda-feira da semana, quando o rótulo tem data. `to_compact` dá
+    listas aninhadas, sem as chaves repetidas dos dicionários; é também o
+    que vai no pickle para os processos do PDF.
+    """
+
+    __slots__ = ("label", "reading", "introduction", "sections", "conclusion", "start")
+
+    def __init__(self, label: str, reading: str | None, introduction: str | None,
+                 sections: list[Section], conclusion: str | None = None, start: date | None = None):
+        self.label = label
+        self.reading = reading
+        self.introduction = introduction
+        self.sections = sections
+        self.conclusion = conclusion
+        self.start = start
+
+    @property
+    def key(self) -> str:
+        return week_key(self.label, self.start)
+
+    @classmethod
+    def from_program(cls, program: dict, reference: date | None = None) -> "Week":
+        """Semana de um programa de `process_data` (partes como texto ou com `parte`/`nome`/`ajudante`).
+
+        `reference` é uma data próxima da semana, para o ano que o rótulo não
+        traz (ver `parse_week_range`).
+        """
+        meta = program["metadata"]
+        sections = []
+        for secao in program.get("secoes", []):
+            parts = []
+            for item in secao.get("itens", []):
+                if isinstance(item, dict):
+                    parts.append(Part.parse(item.get("parte", ""), item.get("nome"), item.get("ajudante")))
+                else:
+                    parts.append(Part.parse(item))
+            sections.append(Section(secao["titulo"], section_kind(secao["titulo"]), parts))
+
+        week_range = parse_week_range(meta["data"], reference)
+        return cls(
+            meta["data"], meta.get("texto_biblico"), meta.get("introducao"),
+            sections, program.get("conclusao"), week_range[0] if week_range else None,
+        )
+
+    def to_compact(self) -> list:
+        return [
+            self.label, self.start.isoformat() if self.start else None,
+            self.reading, self.introduction, self.conclusion,
+            [section.to_compact() for section in self.sections],
+        ]
+
+    @classmethod
+    def from_compact(cls, data) -> "Week":
+        label, start, reading, introduction, conclusion, sections = data
+        return cls(
+            label, reading, introduction,
+            [Section.from_compact(section) for section in sections], conclusion,
+            date.fromisoformat(start) if start else None,
+        )
+
+    def __reduce__(self):
+        return Week.from_compact, (self.to_compact(),)
@@ -0,0 +1,171 @@
+from bs4.dammit import EntitySubstitution
+from html import unescape
+from html.parser import HTMLParser
+
+
+HEADING_TAGS = {"h1", "h2", "h3"}
+
+# Texto dentro destas tags não entra no `.text` do BeautifulSoup
+IGNORED_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+ASCII_SPACES = " \n\t\f\r"
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+}
+
+# Um único evaluate devolve o texto de todos os títulos, sem serializar o DOM.
+# Nós de texto só de espaços viram " " ou "\n", como no `.text` do
+# BeautifulSoup (e no HeadingParser), a não ser dentro de <pre>/<textarea>
+HEADINGS_JS = r"""
+() => Array.from(document.querySelectorAll("h1, h2, h3"), h => {
+    const walker = document.createTreeWalker(h, NodeFilter.SHOW_TEXT);
+    let text = "";
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const parent = node.parentElement;
+        if (parent.closest("script, style, template, rt, rp")) {
+            continue;
+        }
+        if (/^[ \n\t\f\r]*$/.test(node.data) && !parent.closest("pre, textarea")) {
+            text += node.data.includes("\n") ? "\n" : " ";
+        } else {
+            text += node.data;
+        }
+    }
+    return text;
+})
+"""
+
+
+class HeadingParser(HTMLParser):
+    """Lê o HTML em fluxo e guarda só o texto dos h1/h2/h3.
+
+    Segue as mesmas regras do BeautifulSoup com "html.parser" (que usa este
+    mesmo tokenizador): uma tag de fechamento fecha tudo o que foi aberto
+    depois da última tag com aquele nome, fechamentos sem abertura
+    correspondente são ignorados, entidades são resolvidas do mesmo jeito e
+    trechos só de espaços viram um único " " ou "\\n". Assim o resultado é
+    idêntico ao de `soup.find_all(["h1", "h2", "h3"])`, sem montar a árvore.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.headings = []
+        self._stack = []
+        # (posição na pilha, índice em self.headings) dos títulos abertos
+        self._open = []
+        self._ignored = 0
+        self._preserve = 0
+        self._text = []
+        # Tags vazias (<br>) já fechadas, cujo </br> deve ser ignorado
+        self._already_closed = []
+
+    def _end_text(self, cdata=False):
+        """Fecha o trecho de texto atual, como o `endData` do BeautifulSoup."""
+        if not self._text:
+            return
+
+        text = "".join(self._text)
+        self._text = []
+
+        # Seções CDATA entram no texto mesmo dentro de <script>, <rt> etc.
+        if not self._open or (self._ignored and not cdata):
+            return
+
+        if not self._preserve and not text.strip(ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+
+        for _, index in self._open:
+            self.headings[index].append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._end_text()
+        if tag in VOID_TAGS:
+            self._already_closed.append(tag)
+            return
+        self._open_tag(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_text()
+        if tag not in VOID_TAGS:
+            self._open_tag(tag)
+        self.handle_endtag(tag)
+
+    def _open_tag(self, tag):
+        self._stack.append(tag)
+        if tag in HEADING_TAGS:
+            self._open.append((len(self._stack) - 1, len(self.headings)))
+            self.headings.append([])
+        elif tag in IGNORED_TEXT_TAGS:
+            self._ignored += 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self._preserve += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._already_closed:
+            self._already_closed.remove(tag)
+            return
+
+        self._end_text()
+        for position in range(len(self._stack) - 1, -1, -1):
+            if self._stack[position] == tag:
+                break
+        else:
+            return
+
+        closed = self._stack[position:]
+        self._ignored -= sum(1 for t in closed if t in IGNORED_TEXT_TAGS)
+        self._preserve -= sum(1 for t in closed if t in PRESERVE_WHITESPACE_TAGS)
+        del self._stack[position:]
+
+        while self._open and self._open[-1][0] >= position:
+            self._open.pop()
+
+    def handle_data(self, data):
+        if self._open:
+            self._text.append(data)
+
+    def handle_charref(self, name):
+        if self._open:
+            self._text.append(unescape(f"&#{name};"))
+
+    def handle_entityref(self, name):
+        if self._open:
+            character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+            self._text.append(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data):
+        self._end_text()
+
+    def handle_decl(self, decl):
+        self._end_text()
+
+    def handle_pi(self, data):
+        self._end_text()
+
+    def unknown_decl(self, data):
+        self._end_text()
+        if data.upper().startswith("CDATA["):
+            self.handle_data(data[len("CDATA["):])
+            self._end_text(cdata=True)
+
+    def close(self):
+        super().close()
+        self._end_text()
+
+
+def extract_headings(html: str) -> list[str]:
+    """Texto dos h1/h2/h3 do HTML, na ordem do documento."""
+    parser = HeadingParser()
+    parser.feed(html)
+    parser.close()
+
+    return ["".join(chunks).strip() for chunks in parser.headings]
+
+
+def page_headings(page) -> list[str]:
+    """Texto dos h1/h2/h3 da página aberta no navegador."""
+    return [text.strip() for text in page.evaluate(HEADINGS_JS)]
@@ -0,0 +1,238 @@
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Trava exclusiva entre processos sobre o arquivo `path`."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class HttpCache:
+    """Cache em disco das páginas baixadas, indexado pela URL.
+
+    Cada entrada guarda o HTML, o ETag/Last-Modified devolvidos pelo servidor
+    e um TTL em segundos (`None` = nunca expira). Entradas vencidas continuam
+    servindo para a revalidação condicional: se o servidor responder 304, o
+    HTML guardado é reaproveitado. Quando o total passa de `max_bytes`, as
+    entradas usadas há mais tempo são removidas.
+
+    O index.json não é reescrito a cada página: as mudanças se acumulam em
+    memória e vão para o disco a cada `SAVE_EVERY` alterações, depois de
+    `SAVE_INTERVAL` segundos ou no `flush()`. O app e o worker usam o mesmo
+    diretório, então a gravação junta o índice do disco com o daqui sob uma
+    trava de arquivo e aplica o limite de tamanho sobre o resultado.
+    """
+
+    SAVE_EVERY = 32
+    SAVE_INTERVAL = 5.0
+    # Corpo sem entrada no índice há mais tempo que isso é lixo de um processo
+    # que morreu antes de gravar o índice
+    ORPHAN_AGE = 24 * 3600
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock_path = os.path.join(directory, "index.lock")
+
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        self._index = self._read_index()
+        self._total = sum(e["size"] for e in self._index.values())
+        # URL -> quando foi removida daqui, para a junção não ressuscitar a entrada
+        self._removed = {}
+        self._dirty = False
+        self._pending = 0
+        self._saved_at = time.monotonic()
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.directory, self._key(url) + ".html")
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        return entry["ttl"] is None or time.time() - entry["stored_at"] < entry["ttl"]
+
+    def get(self, url: str) -> dict | None:
+        """Entrada da URL com o HTML em `body`, ou None se não estiver no cache."""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+
+            try:
+                with open(self._body_path(url), "r", encoding="utf-8") as f:
+                    body = f.read()
+            except OSError:
+                self._forget(url)
+                return None
+
+            entry["last_access"] = time.time()
+            self._dirty = True
+            return {**entry, "body": body}
+
+    def put(self, url, body, etag=None, last_modified=None, ttl=None):
+        data = body.encode("utf-8")
+        path = self._body_path(url)
+
+        with self._lock:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            old = self._index.get(url)
+            if old is not None:
+                self._total -= old["size"]
+
+            now = time.time()
+            self._index[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "ttl": ttl,
+                "stored_at": now,
+                "last_access": now,
+                "size": len(data),
+            }
+            self._total += len(data)
+            self._removed.pop(url, None)
+
+            self._evict()
+            self._changed()
+
+    def revalidated(self, url, ttl=None):
+        """Servidor confirmou (304) que o HTML guardado ainda vale."""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return
+
+            entry["ttl"] = ttl
+            entry["stored_at"] = entry["last_access"] = time.time()
+            self._changed()
+
+    def _changed(self):
+        """Conta uma alteração e grava o índice se já juntou o bastante."""
+        self._dirty = True
+        self._pending += 1
+        if (
+            self._pending >= self.SAVE_EVERY
+            or time.monotonic() - self._saved_at >= self.SAVE_INTERVAL
+        ):
+            self._save_index()
+
+    def _forget(self, url: str):
+        self._total -= self._index.pop(url)["size"]
+        self._removed[url] = time.time()
+        self._dirty = True
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+
+        for url in sorted(self._index, key=lambda u: self._index[u]["last_access"]):
+            if self._total <= self.max_bytes:
+                break
+
+            self._forget(url)
+            try:
+                os.remove(self._body_path(url))
+            except OSError:
+                pass
+
+    def _merge(self, disk: dict) -> dict:
+        """Índice do disco com as mudanças deste processo por cima."""
+        for url, removed_at in self._removed.items():
+            entry = disk.get(url)
+            if entry is not None and entry["stored_at"] <= removed_at:
+                del disk[url]
+
+        for url, entry in self._index.items():
+            other = disk.get(url)
+            if other is not None and other["stored_at"] > entry["stored_at"]:
+                entry = other
+            if other is not None:
+                entry = {
+                    **entry,
+                    "last_access": max(entry["last_access"], other["last_access"]),
+                }
+            disk[url] = entry
+        return disk
+
+    def _sweep_orphans(self):
+        """Apaga corpos antigos que nenhum processo pôs no índice."""
+        keys = {self._key(url) for url in self._index}
+        limit = time.time() - self.ORPHAN_AGE
+        for name in os.listdir(self.directory):
+            if not name.endswith((".html", ".tmp")) or name.split(".")[0] in keys:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < limit:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _save_index(self):
+        with _file_lock(self.lock_path):
+            self._index = self._merge(self._read_index())
+            self._total = sum(e["size"] for e in self._index.values())
+            # O limite vale para o diretório todo, não só para o que este
+            # processo baixou
+            self._evict()
+            self._sweep_orphans()
+
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+
+        self._removed.clear()
+        self._dirty = False
+        self._pending = 0
+        self._saved_at = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._save_index()
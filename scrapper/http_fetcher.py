@@ -0,0 +1,123 @@
+from scrapper import tracing
+import httpx
+
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "es-MX,es;q=0.9",
+}
+
+
+class HttpFetcher:
+    """Baixa as páginas do wol.jw.org sem navegador.
+
+    As páginas de índice e de semana vêm renderizadas do servidor, então o
+    HTML cru já traz os cards e os títulos. Um único `httpx.Client` mantém as
+    conexões keep-alive abertas e é seguro para usar a partir de várias threads.
+    """
+
+    def __init__(
+        self, max_connections: int = 8, timeout: float = 15, cache=None, ttl_policy=None
+    ):
+        # `ttl_policy(url)` diz por quantos segundos a página vale no cache
+        self.cache = cache
+        self.ttl_policy = ttl_policy or (lambda url: None)
+
+        self.client = httpx.Client(**self._client_options(max_connections, timeout))
+
+    @staticmethod
+    def _client_options(max_connections: int, timeout: float) -> dict:
+        return {
+            "headers": HEADERS,
+            "timeout": timeout,
+            "follow_redirects": True,
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        }
+
+    def _cached(self, url: str) -> tuple[dict | None, dict]:
+        """Entrada do cache da URL e os cabeçalhos da requisição condicional."""
+        entry = self.cache.get(url)
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return entry, headers
+
+    def _body(self, url: str, response, entry: dict | None) -> str:
+        """HTML da resposta, guardando no cache (ou reaproveitando, se veio 304)."""
+        tracing.count("http_bytes", len(response.content))
+        if self.cache is None:
+            response.raise_for_status()
+            return response.text
+
+        ttl = self.ttl_policy(url)
+        if response.status_code == 304 and entry is not None:
+            tracing.count("cache_revalidated")
+            self.cache.revalidated(url, ttl)
+            return entry["body"]
+
+        response.raise_for_status()
+        self.cache.put(
+            url,
+            response.text,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            ttl=ttl,
+        )
+        return response.text
+
+    def get_html(self, url: str) -> str:
+        if self.cache is None:
+            return self._body(url, self.client.get(url), None)
+
+        entry, headers = self._cached(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            tracing.count("cache_hits")
+            return entry["body"]
+
+        return self._body(url, self.client.get(url, headers=headers), entry)
+
+    def close(self):
+        self.client.close()
+        if self.cache is not None:
+            self.cache.flush()
+
+
+class AsyncHttpFetcher(HttpFetcher):
+    """O mesmo HttpFetcher sobre um `httpx.AsyncClient`, para o AsyncDataScrapper.
+
+    Várias páginas podem estar sendo baixadas ao mesmo tempo a partir de uma
+    única thread; o cache em disco continua o mesmo.
+    """
+
+    def __init__(
+        self, max_connections: int = 8, timeout: float = 15, cache=None, ttl_policy=None
+    ):
+        self.cache = cache
+        self.ttl_policy = ttl_policy or (lambda url: None)
+        self.client = httpx.AsyncClient(**self._client_options(max_connections, timeout))
+
+    async def get_html(self, url: str) -> str:
+        if self.cache is None:
+            return self._body(url, await self.client.get(url), None)
+
+        entry, headers = self._cached(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            tracing.count("cache_hits")
+            return entry["body"]
+
+        return self._body(url, await self.client.get(url, headers=headers), entry)
+
+    async def close(self):
+        await self.client.aclose()
+        if self.cache is not None:
+            self.cache.flush()
@@ -0,0 +1,190 @@
+from contextvars import ContextVar, copy_context
+import asyncio
+import threading
+import time
+
+
+# Job em execução na thread (ou no contexto copiado) atual
+current_job = ContextVar("current_job", default=None)
+
+
+class JobCancelled(Exception):
+    """O job foi cancelado ou passou do tempo limite."""
+
+
+def check_cancelled():
+    """Interrompe o trabalho atual se o job dele foi cancelado ou expirou.
+
+    Os pontos de parada ficam no scraper: antes de cada página, dentro do
+    loop que espera as abas do navegador e a cada semana pronta.
+    """
+    job = current_job.get()
+    if job is not None:
+        job.raise_if_cancelled()
+
+
+def propagate_context(fn):
+    """`fn` rodando com o contexto de quem a criou, em qualquer thread.
+
+    Threads de pools e das sessões de navegador não herdam as ContextVar;
+    sem isso o `check_cancelled` delas não enxergaria o job.
+    """
+    context = copy_context()
+    # Cada chamada usa a sua cópia: um mesmo Context não pode estar ativo
+    # em duas threads ao mesmo tempo
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+
+class Job:
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMEOUT = "timeout"
+
+    def __init__(self, key: str, fn, timeout: float | None = None):
+        self.key = key
+        self.fn = fn
+        self.timeout = timeout
+        self.status = self.PENDING
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._future = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (self.PENDING, self.RUNNING)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def cancel(self):
+        self._cancel.set()
+
+    def timed_out(self) -> bool:
+        return (
+            self.timeout is not None
+            and self.started_at is not None
+            and time.monotonic() - self.started_at > self.timeout
+        )
+
+    def raise_if_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled(f"{self.key}: cancelado")
+        if self.timed_out():
+            raise JobCancelled(f"{self.key}: tempo esgotado ({self.timeout:.0f}s)")
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._finished.wait(timeout)
+
+
+class JobManager:
+    """Fila das extrações pedidas pela interface.
+
+    No máximo `max_jobs` rodam ao mesmo tempo; pedir de novo um job que
+    ainda está na fila ou rodando devolve o mesmo job em vez de abrir outra
+    extração. `cancel` e o `timeout` de cada job param o trabalho no
+    próximo `check_cancelled`, inclusive no meio das navegações.
+    `on_change(job)` é chamado a cada mudança de status.
+
+    Os jobs são corrotinas: rodam no loop de eventos de quem os agenda e
+    dividem o limite de `max_jobs` entre si.
+    """
+
+    def __init__(self, max_jobs: int = 1, on_change=None):
+        self.on_change = on_change or (lambda job: None)
+        self.max_jobs = max(1, max_jobs)
+        self._async_slots = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit_async(self, key: str, fn, run_task, timeout: float | None = None) -> tuple[Job, bool]:
+        """Agenda a corrotina `fn()` com `run_task`; devolve (job, criado).
+
+        `criado` é False se o job já existia. `run_task(corrotina_fn, *args)`
+        deve devolver um Future, como o `page.run_task` do Flet. Cancelar o
+        job cancela a task na hora, mesmo no meio de uma navegação.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.active:
+                return job, False
+
+            job = Job(key, fn, timeout)
+            self._jobs[key] = job
+            job._future = run_task(self._run_async, job)
+
+        # Cancelado ainda na fila: a corrotina pode nem chegar a rodar
+        job._future.add_done_callback(
+            lambda future: future.cancelled() and job.status == Job.PENDING
+            and self._set_status(job, Job.CANCELLED)
+        )
+        self.on_change(job)
+        return job, True
+
+    async def _run_async(self, job: Job):
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_jobs)
+
+        async with self._async_slots:
+            if job._cancel.is_set():
+                self._set_status(job, Job.CANCELLED)
+                return
+
+            job.started_at = time.monotonic()
+            self._set_status(job, Job.RUNNING)
+            token = current_job.set(job)
+            try:
+                job.result = await asyncio.wait_for(job.fn(), job.timeout)
+            except (JobCancelled, asyncio.TimeoutError) as e:
+                job.error = str(e) or f"{job.key}: tempo esgotado ({job.timeout:.0f}s)"
+                self._set_status(job, Job.TIMEOUT if job.timed_out() else Job.CANCELLED)
+            except asyncio.CancelledError:
+                job.error = f"{job.key}: cancelado"
+                self._set_status(job, Job.CANCELLED)
+                raise
+            except Exception as e:
+                print(f"Erro no job {job.key}: {e}")
+                job.error = str(e)
+                self._set_status(job, Job.FAILED)
+            else:
+                self._set_status(job, Job.DONE)
+            finally:
+                current_job.reset(token)
+
+    def _set_status(self, job: Job, status: str):
+        job.status = status
+        if status not in (Job.PENDING, Job.RUNNING):
+            job.finished_at = time.monotonic()
+            job._finished.set()
+        self.on_change(job)
+
+    def get(self, key: str) -> Job | None:
+        return self._jobs.get(key)
+
+    def active(self) -> list[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if job.active]
+
+    def cancel(self, key: str):
+        job = self._jobs.get(key)
+        if job is None:
+            return
+
+        job.cancel()
+        if job._future is not None:
+            # Interrompe a task no próximo await; o status vem do _run_async
+            job._future.cancel()
+
+    def shutdown(self):
+        """Cancela tudo; não espera os jobs que estão parando."""
+        for job in self.active():
+            self.cancel(job.key)
@@ -0,0 +1,431 @@
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from scrapper.jobs import JobCancelled, check_cancelled
+from scrapper import tracing
+import asyncio
+import httpx
+import random
+import threading
+import time
+
+
+# Respostas que valem uma nova tentativa; 429 e 503 são o site pedindo calma
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+
+
+class CircuitOpen(Exception):
+    """O host falhou várias vezes seguidas e está em pausa; nada foi pedido a ele.
+
+    `retry_in` é quanto falta para valer a pena perguntar de novo e
+    `openings` quantas vezes o disjuntor já tinha aberto.
+    """
+
+    def __init__(self, message: str, retry_in: float = 0.0, openings: int = 0):
+        super().__init__(message)
+        self.retry_in = retry_in
+        self.openings = openings
+
+
+class RetryPolicy:
+    """Quantas vezes tentar uma página e quanto esperar entre as tentativas.
+
+    A espera cresce em potências de dois a partir de `base_delay`, até
+    `max_delay`, e é sorteada entre zero e esse valor ("full jitter"), para
+    as semanas que falharam juntas não voltarem todas juntas. Um
+    `Retry-After` do servidor é respeitado.
+    """
+
+    def __init__(self, attempts: int = 4, base_delay: float = 0.5, max_delay: float = 10):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def retryable(error: Exception) -> bool:
+        """Se o erro é passageiro (timeout, conexão, 5xx, 429) e vale tentar de novo."""
+        if isinstance(error, (JobCancelled, CircuitOpen)):
+            return False
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRY_STATUS
+        if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+            return True
+        # Erros do Playwright, sem importá-lo: timeout de navegação ou falha de rede
+        if type(error).__module__.startswith("playwright"):
+            return "Timeout" in type(error).__name__ or "net::" in str(error)
+        return False
+
+    @staticmethod
+    def throttled(error: Exception) -> bool:
+        return (
+            isinstance(error, httpx.HTTPStatusError)
+            and error.response.status_code in THROTTLE_STATUS
+        )
+
+    @staticmethod
+    def retry_after(error: Exception) -> float | None:
+        """Segundos pedidos no `Retry-After` da resposta, se houver."""
+        if not isinstance(error, httpx.HTTPStatusError):
+            return None
+        value = error.response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt: int, error: Exception | None = None) -> float:
+        """Espera antes da tentativa `attempt + 1` (a primeira é a 0)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = self.retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """Disjuntor de um host: depois de `failure_threshold` falhas seguidas, para de pedir.
+
+    Aberto, recusa tudo com CircuitOpen por `reset_timeout` segundos; depois
+    deixa passar uma requisição de teste ("meio aberto"), que fecha o
+    disjuntor se der certo e o abre de novo se falhar. Quem recebe
+    CircuitOpen espera `retry_in` e pergunta de novo (ver FetchScheduler).
+    """
+
+    # Quanto esperar pelo resultado da requisição de teste de outra thread
+    PROBE_POLL = 0.1
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.openings = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Levanta CircuitOpen se o host não deve receber a requisição agora."""
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpen(
+                        f"{self.host} em pausa por mais {remaining:.0f}s "
+                        f"depois de {self.failures} falhas seguidas",
+                        remaining, self.openings,
+                    )
+                self.state = self.HALF_OPEN
+                self._probing = False
+
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpen(
+                        f"{self.host} em teste depois de uma pausa",
+                        self.PROBE_POLL, self.openings,
+                    )
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"{self.host} respondeu de novo; disjuntor fechado")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self):
+        """A tentativa terminou sem dizer nada sobre o host (cancelada, 404...)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            reopen = self.state == self.HALF_OPEN
+            if reopen or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.openings += 1
+                self._opened_at = time.monotonic()
+                self._probing = False
+                tracing.count("circuit_opened")
+                print(
+                    f"{self.host}: {self.failures} falhas seguidas; "
+                    f"pausa de {self.reset_timeout:.0f}s"
+                )
+
+
+class AdaptiveLimiter:
+    """Limite de requisições em andamento que se ajusta ao que o site aguenta.
+
+    Cresce devagar a cada sucesso (um a mais a cada `limit` sucessos) e cai
+    pela metade em timeouts, erros de servidor e 429, no máximo uma vez a
+    cada `cooldown` segundos, para uma rajada de falhas contar como uma só.
+    Usado com `with limiter:` a partir de várias threads.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16, cooldown: float = 1.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._limit = float(min(self.maximum, max(self.minimum, initial)))
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_success(self):
+        with self._lock:
+            before = self.limit
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            if self.limit > before:
+                self._wake()
+
+    def on_congestion(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            before = self.limit
+            self._limit = max(self.minimum, self._limit / 2)
+            if self.limit < before:
+                tracing.count("concurrency_decreased")
+
+    def try_acquire(self) -> bool:
+        """Ocupa uma vaga se houver, sem esperar."""
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def acquire(self):
+        with self._changed:
+            while self.in_flight >= self.limit:
+                # Acorda de tempos em tempos para ver se o job foi cancelado
+                self._changed.wait(0.1)
+                check_cancelled()
+            self.in_flight += 1
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self):
+        """Chamado com `self._lock`: avisa quem espera que pode haver vaga."""
+        self._changed.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """AdaptiveLimiter para corrotinas de um mesmo loop de eventos (`async with`)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._waiters = []
+
+    async def acquire(self):
+        while True:
+            with self._lock:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+    def _wake(self):
+        for waiter in self._waiters[: max(0, self.limit - self.in_flight)]:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+class FetchScheduler:
+    """Por onde passa cada página baixada do site.
+
+    Cada chamada espera uma vaga no AdaptiveLimiter, passa pelo disjuntor do
+    host e, se falhar com um erro passageiro, é repetida segundo a
+    RetryPolicy. A vaga fica livre durante a espera entre as tentativas.
+
+    Com o disjuntor aberto, a chamada espera a pausa (ou o teste do host)
+    em vez de desistir: uma queda curta do site só atrasa as semanas. Cada
+    teste que falha durante a espera conta como uma tentativa dela, então
+    um host que não volta ainda faz a chamada desistir.
+    """
+
+    limiter_class = AdaptiveLimiter
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_concurrency: int | None = None,
+        policy: RetryPolicy | None = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+    ):
+        self.policy = policy or RetryPolicy()
+        self.limiter = self.limiter_class(
+            concurrency, maximum=max_concurrency or concurrency
+        )
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).hostname or url
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    host, self.failure_threshold, self.reset_timeout
+                )
+            return self._breakers[host]
+
+    def succeeded(self, url: str):
+        self.breaker(url).record_success()
+        self.limiter.on_success()
+
+    def failed(self, url: str, error: Exception, attempt: int) -> float | None:
+        """Anota a falha da tentativa `attempt`; devolve a espera até a próxima, ou None para desistir."""
+        if not self.policy.retryable(error):
+            self.breaker(url).release()
+            return None
+
+        self.breaker(url).record_failure()
+        self.limiter.on_congestion()
+        if self.policy.throttled(error):
+            tracing.count("throttled")
+        if attempt + 1 >= self.policy.attempts:
+            return None
+
+        delay = self.policy.delay(attempt, error)
+        tracing.count("retries")
+        # Só a primeira linha: as mensagens do httpx trazem um link de ajuda
+        motivo = str(error).splitlines()[0] if str(error) else type(error).__name__
+        print(f"{url}: {motivo}; nova tentativa em {delay:.1f}s")
+        return delay
+
+    def circuit_wait(self, error: CircuitOpen, attempt: int, first_opening: int) -> float | None:
+        """Espera pelo disjuntor aberto antes de perguntar de novo, ou None para desistir.
+
+        `first_opening` é o `error.openings` da primeira recusa: as aberturas
+        depois dela são testes do host que falharam enquanto se esperava.
+        """
+        if attempt + error.openings - first_opening >= self.policy.attempts:
+            return None
+        return error.retry_in
+
+    def call(self, url: str, fn):
+        """`fn()` para baixar `url`, com as novas tentativas; levanta o último erro."""
+        attempt = 0
+        first_opening = None
+        while True:
+            check_cancelled()
+            try:
+                self.breaker(url).before_call()
+            except CircuitOpen as e:
+                first_opening = e.openings if first_opening is None else first_opening
+                delay = self.circuit_wait(e, attempt, first_opening)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+                continue
+
+            first_opening = None
+            try:
+                with self.limiter:
+                    result = fn()
+            except Exception as e:
+                delay = self.failed(url, e, attempt)
+                if delay is None:
+                    raise
+            else:
+                self.succeeded(url)
+                return result
+
+            self._sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _sleep(delay: float):
+        deadline = time.monotonic() + delay
+        while True:
+            check_cancelled()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(0.1, remaining))
+
+
+class AsyncFetchScheduler(FetchScheduler):
+    """FetchScheduler para o AsyncDataScrapper: `await scheduler.call(url, fn)`, com `fn()` uma corrotina."""
+
+    limiter_class = AsyncAdaptiveLimiter
+
+    async def call(self, url: str, fn):
+        attempt = 0
+        first_opening = None
+        while True:
+            check_cancelled()
+            try:
+                self.breaker(url).before_call()
+            except CircuitOpen as e:
+                first_opening = e.openings if first_opening is None else first_opening
+                delay = self.circuit_wait(e, attempt, first_opening)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            first_opening = None
+            try:
+                async with self.limiter:
+                    result = await fn()
+            except asyncio.CancelledError:
+                self.breaker(url).release()
+                raise
+            except Exception as e:
+                delay = self.failed(url, e, attempt)
+                if delay is None:
+                    raise
+            else:
+                self.succeeded(url)
+                return result
+
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,171 @@
+from scrapper import tracing
+import threading
+import time
+
+
+# A página está pronta para a etapa quando o HTML já foi todo lido e existe
+# um elemento do seletor que não veio da página anterior
+READY_JS = """
+selector => document.readyState !== "loading"
+    && Array.from(document.querySelectorAll(selector)).some(e => !e.hasAttribute("data-sonntag-lido"))
+"""
+
+# Marca o que a página atual já tem, para não ser confundido com a próxima
+FORGET_JS = """
+selector => document.querySelectorAll(selector).forEach(e => e.setAttribute("data-sonntag-lido", ""))
+"""
+
+# Marca e dispara a navegação sem bloquear a chamada do evaluate
+NAVIGATE_JS = """
+([url, selector]) => {
+    document.querySelectorAll(selector).forEach(e => e.setAttribute("data-sonntag-lido", ""));
+    setTimeout(() => window.location.assign(url), 0);
+}
+"""
+
+
+class ReadyStage:
+    """O que uma etapa precisa na página e quanto tempo (s) esperar por isso.
+
+    `baseline` é a espera que a etapa usava antes ("load" ou "networkidle");
+    só é usada para medir a economia.
+    """
+
+    def __init__(self, name: str, selector: str, timeout: float, baseline: str = "load"):
+        self.name = name
+        self.selector = selector
+        self.timeout = timeout
+        self.baseline = baseline
+
+
+class PageReadiness:
+    """Espera cada página só até ela ter o que a etapa vai ler.
+
+    No lugar de `load` e `networkidle`, que no wol.jw.org ficam esperando
+    analytics e outras requisições de fundo, espera o seletor da etapa com
+    o HTML já lido. Com `measure=True`, depois de pronta a página também
+    espera o `baseline` da etapa, e o relatório mostra quanto tempo foi
+    economizado em cada página; é um modo de medição, mais lento.
+    `navigation_timeout` limita a navegação até o servidor responder; o
+    `timeout` da etapa limita a espera depois disso.
+    """
+
+    def __init__(self, navigation_timeout: float = 30, measure: bool = False):
+        self.navigation_timeout = navigation_timeout
+        self.measure = measure
+        self._lock = threading.Lock()
+        self._report = []
+
+    def goto(self, page, url: str, stage: ReadyStage):
+        """Abre `url` e volta assim que a página estiver pronta para a etapa."""
+        start = time.perf_counter()
+        with tracing.span("goto", url):
+            page.goto(url, wait_until="commit", timeout=self.navigation_timeout * 1000)
+        self.wait(page, stage, url, start)
+
+    def forget(self, page, stage: ReadyStage):
+        """Ignora o que a página já mostra; usado antes de um clique que troca o conteúdo."""
+        page.evaluate(FORGET_JS, stage.selector)
+
+    def wait(self, page, stage: ReadyStage, url: str | None = None, start: float | None = None):
+        """Espera a etapa ficar pronta na página; `start` é o início da navegação."""
+        start = time.perf_counter() if start is None else start
+        with tracing.span(f"wait_{stage.name}", url):
+            page.wait_for_function(
+                READY_JS, arg=stage.selector, timeout=stage.timeout * 1000
+            )
+        self.ready(page, stage, url or page.url, start)
+
+    def navigate(self, page, url: str, stage: ReadyStage) -> float:
+        """Dispara a navegação sem esperar; devolve o prazo (time.monotonic) para ficar pronta.
+
+        Use `is_ready` para acompanhar e `ready` para registrar.
+        """
+        page.evaluate(NAVIGATE_JS, [url, stage.selector])
+        return time.monotonic() + self.navigation_timeout + stage.timeout
+
+    def is_ready(self, page, stage: ReadyStage) -> bool:
+        try:
+            return page.evaluate(READY_JS, stage.selector)
+        except Exception:
+            # Contexto destruído no meio da troca de página
+            return False
+
+    def ready(self, page, stage: ReadyStage, url: str, start: float):
+        """Registra que a página ficou pronta; no modo de medição, espera o baseline."""
+        entry = self._entry(stage, url, start)
+        if self.measure:
+            try:
+                page.wait_for_load_state(stage.baseline, timeout=stage.timeout * 1000)
+                self._baseline_reached(entry, stage, start)
+            except Exception as e:
+                print(f"{url}: {stage.baseline} não chegou ({e})")
+        self._add(entry)
+
+    @staticmethod
+    def _entry(stage: ReadyStage, url: str, start: float) -> dict:
+        return {
+            "stage": stage.name,
+            "url": url,
+            "ready_s": round(time.perf_counter() - start, 4),
+        }
+
+    @staticmethod
+    def _baseline_reached(entry: dict, stage: ReadyStage, start: float):
+        entry["baseline"] = stage.baseline
+        entry["baseline_s"] = round(time.perf_counter() - start, 4)
+        entry["saved_s"] = round(entry["baseline_s"] - entry["ready_s"], 4)
+        tracing.count("wait_saved_ms", int(entry["saved_s"] * 1000))
+
+    def _add(self, entry: dict):
+        with self._lock:
+            self._report.append(entry)
+
+    def take_report(self) -> list[dict]:
+        """Tempo de cada página desde a última chamada, e limpa o relatório."""
+        with self._lock:
+            report, self._report = self._report, []
+        return report
+
+    @staticmethod
+    def print_report(report):
+        for r in report:
+            line = f"{r['url']}: {r['stage']} pronta em {r['ready_s']:.2f}s"
+            if "saved_s" in r:
+                line += f" ({r['saved_s']:.2f}s a menos que o {r['baseline']}, {r['baseline_s']:.2f}s)"
+            print(line)
+
+
+class AsyncPageReadiness(PageReadiness):
+    """PageReadiness para as páginas da API assíncrona do Playwright.
+
+    Cada aba é esperada na sua própria corrotina, então não há `navigate`
+    nem `is_ready`: várias chamadas a `goto` ficam em andamento juntas.
+    """
+
+    async def goto(self, page, url: str, stage: ReadyStage):
+        start = time.perf_counter()
+        with tracing.span("goto", url):
+            await page.goto(url, wait_until="commit", timeout=self.navigation_timeout * 1000)
+        await self.wait(page, stage, url, start)
+
+    async def forget(self, page, stage: ReadyStage):
+        await page.evaluate(FORGET_JS, stage.selector)
+
+    async def wait(self, page, stage: ReadyStage, url: str | None = None, start: float | None = None):
+        start = time.perf_counter() if start is None else start
+        with tracing.span(f"wait_{stage.name}", url):
+            await page.wait_for_function(
+                READY_JS, arg=stage.selector, timeout=stage.timeout * 1000
+            )
+        await self.ready(page, stage, url or page.url, start)
+
+    async def ready(self, page, stage: ReadyStage, url: str, start: float):
+        entry = self._entry(stage, url, start)
+        if self.measure:
+            try:
+                await page.wait_for_load_state(stage.baseline, timeout=stage.timeout * 1000)
+                self._baseline_reached(entry, stage, start)
+            except Exception as e:
+                print(f"{url}: {stage.baseline} não chegou ({e})")
+        self._add(entry)
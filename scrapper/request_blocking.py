@@ -0,0 +1,182 @@
+from collections import defaultdict
+from urllib.parse import urlparse
+import json
+import os
+import threading
+
+
+# Tipos de recurso que não interferem nos títulos h1/h2/h3 da página
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "hotjar.com",
+    "newrelic.com",
+    "nr-data.net",
+    "facebook.net",
+)
+
+FIRST_PARTY_HOSTS = ("jw.org", "jw-cdn.org")
+
+
+def _host_matches(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class ResourceSizes:
+    """URL de recurso -> Content-Length, guardado em JSON entre execuções.
+
+    Requisições abortadas não chegam a ter tamanho; esta tabela é preenchida
+    por uma rodada sem bloqueio (`block_resources=False`) e usada depois para
+    estimar quanto as rodadas com bloqueio economizam. Pode ser usado por
+    várias threads.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._sizes = {}
+        if path is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._sizes = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def get(self, url: str) -> int | None:
+        with self._lock:
+            return self._sizes.get(url)
+
+    def learn(self, url: str, size: int):
+        with self._lock:
+            if self._sizes.get(url) != size:
+                self._sizes[url] = size
+                self._dirty = True
+
+    def save(self):
+        """Grava a tabela se algum tamanho novo foi aprendido."""
+        with self._lock:
+            if not self._dirty or self.path is None:
+                return
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._sizes, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+class ResourceBlocker:
+    """Intercepta as requisições de um contexto e descarta o que o scraping não usa.
+
+    Requisições abortadas não chegam a ter tamanho, então `bytes_saved` soma
+    os tamanhos de `sizes`. Bloqueios sem tamanho conhecido não entram na
+    soma e ficam em `blocked_unsized`; se nenhum bloqueio tinha tamanho,
+    `bytes_saved` é None (desconhecido), não 0. Com `block=False` nada é
+    bloqueado e a tabela é preenchida.
+    """
+
+    def __init__(self, block: bool = True, sizes: ResourceSizes | None = None):
+        self.block = block
+        self.sizes = sizes if sizes is not None else ResourceSizes()
+        self._lock = threading.Lock()
+        self._stats = defaultdict(self._empty_stats)
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {
+            "requests_allowed": 0,
+            "requests_blocked": 0,
+            "bytes_received": 0,
+            "bytes_saved": 0,
+            "blocked_unsized": 0,
+            "blocked_by_type": defaultdict(int),
+        }
+
+    def install(self, context):
+        # Sem bloqueio não vale pagar a interceptação de cada requisição
+        if self.block:
+            context.route("**/*", self._handle_route)
+        context.on("response", self._on_response)
+
+    async def install_async(self, context):
+        """`install` para um contexto da API assíncrona do Playwright."""
+        if self.block:
+            await context.route("**/*", self._handle_route_async)
+        context.on("response", self._on_response)
+
+    def block_reason(self, request) -> str | None:
+        resource_type = request.resource_type
+        if resource_type in BLOCKED_RESOURCE_TYPES:
+            return resource_type
+
+        host = urlparse(request.url).hostname or ""
+        if _host_matches(host, ANALYTICS_HOSTS):
+            return "analytics"
+        if resource_type == "script" and not _host_matches(host, FIRST_PARTY_HOSTS):
+            return "third_party_script"
+        return None
+
+    @staticmethod
+    def _page_of(request):
+        try:
+            return request.frame.page
+        except Exception:
+            # Requisições de service worker não pertencem a nenhuma aba
+            return None
+
+    def _should_block(self, request) -> bool:
+        """Decide se a requisição é descartada e conta o bloqueio na aba dela."""
+        reason = self.block_reason(request)
+        if reason is None:
+            return False
+
+        size = self.sizes.get(request.url)
+        with self._lock:
+            stats = self._stats[self._page_of(request)]
+            stats["requests_blocked"] += 1
+            stats["blocked_by_type"][reason] += 1
+            if size is None:
+                stats["blocked_unsized"] += 1
+            else:
+                stats["bytes_saved"] += size
+        return True
+
+    def _handle_route(self, route):
+        if self._should_block(route.request):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def _handle_route_async(self, route):
+        if self._should_block(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _on_response(self, response):
+        request = response.request
+        length = response.headers.get("content-length")
+        size = int(length) if length and length.isdigit() else None
+
+        with self._lock:
+            stats = self._stats[self._page_of(request)]
+            stats["requests_allowed"] += 1
+            stats["bytes_received"] += size or 0
+
+        # Sem Content-Length o tamanho fica desconhecido em vez de virar 0
+        if size is not None and self.block_reason(request) is not None:
+            self.sizes.learn(request.url, size)
+
+    def take(self, page) -> dict:
+        """Devolve e zera as estatísticas acumuladas pela aba desde a última chamada."""
+        with self._lock:
+            stats = self._stats.pop(page, None) or self._empty_stats()
+
+        stats["blocked_by_type"] = dict(stats["blocked_by_type"])
+        if stats["blocked_unsized"] == stats["requests_blocked"] > 0:
+            stats["bytes_saved"] = None
+        return stats
@@ -0,0 +1,104 @@
+from scrapper.jobs import JobCancelled, check_cancelled, propagate_context
+import json
+import os
+import queue
+import textwrap
+import threading
+
+
+# Marca o fim do que a thread produtora entrega
+_END = object()
+
+
+def iter_from_thread(produce, maxsize: int):
+    """Gera, na thread de quem consome, o que `produce(put)` entrega em outra thread.
+
+    No máximo `maxsize` itens ficam esperando: com a fila cheia, `put`
+    bloqueia e a produtora para até o consumidor andar. Se o consumidor
+    para de ler (fecha o gerador ou é cancelado), `put` levanta
+    JobCancelled para a produtora terminar. Um erro da produtora é levantado
+    aqui, depois dos itens que ela já tinha entregado.
+    """
+    items = queue.Queue(maxsize=max(1, maxsize))
+    stopped = threading.Event()
+    errors = []
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise JobCancelled("a leitura das semanas parou")
+
+    def run():
+        try:
+            produce(put)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            try:
+                put(_END)
+            except JobCancelled:
+                pass
+
+    thread = threading.Thread(target=propagate_context(run), name="stream-producer", daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                item = items.get(timeout=0.1)
+            except queue.Empty:
+                check_cancelled()
+                continue
+            if item is _END:
+                break
+            yield item
+
+        if errors:
+            raise errors[0]
+    finally:
+        stopped.set()
+        thread.join()
+
+
+class JsonArrayWriter:
+    """Grava uma lista JSON item a item, sem montar a lista na memória.
+
+    O resultado é o mesmo de `json.dump(itens, f, indent=indent,
+    ensure_ascii=False)`. O arquivo é escrito ao lado e só substitui o
+    anterior no fim do `with`; se der erro no meio, o anterior fica.
+    """
+
+    def __init__(self, path: str, indent: int = 4):
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._file.write("[")
+
+    def write(self, item):
+        text = json.dumps(item, indent=self.indent, ensure_ascii=False)
+        self._file.write("," if self.count else "")
+        self._file.write("\n" + textwrap.indent(text, " " * self.indent))
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n]" if self.count else "]")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self):
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,165 @@
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Trace da extração em andamento; segue para outras threads com
+# `propagate_context`, junto com o job atual
+current_trace = ContextVar("current_trace", default=None)
+
+
+def peak_rss_mb() -> float | None:
+    """Pico de memória residente do processo até agora, em MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Tracer:
+    """Tempos por etapa (spans) e contadores de uma extração.
+
+    Cada span guarda o nome da etapa, a URL quando houver, o início relativo
+    ao começo do trace, a duração e a thread. `save` grava tudo em JSON e
+    `summary_text` resume para a interface.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self.spans = []
+        self.counters = {}
+        self.peak_rss_start_mb = peak_rss_mb()
+        self.peak_rss_mb = None
+        # Pico de memória dos processos cujos traces foram juntados com `merge`
+        self.children_peak_rss_mb = {}
+        self.total_s = None
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, duration: float, url: str | None = None):
+        """Registra um span já medido; `start` vem de `time.perf_counter()`."""
+        span = {
+            "name": name,
+            "start_s": round(start - self._t0, 6),
+            "duration_s": round(duration, 6),
+            "thread": threading.current_thread().name,
+        }
+        if url is not None:
+            span["url"] = url
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, url: str | None = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start, url)
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, data: dict, start: float, process: str):
+        """Junta o trace de outro processo (saída de `to_dict`).
+
+        `start` é o `time.perf_counter()` deste processo em que o outro
+        trace começou; os spans entram marcados com `process`.
+        """
+        offset = start - self._t0
+        with self._lock:
+            for span in data["spans"]:
+                self.spans.append(
+                    {**span, "start_s": round(span["start_s"] + offset, 6), "process": process}
+                )
+            for name, value in data["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            if data.get("peak_rss_mb") is not None:
+                self.children_peak_rss_mb[process] = data["peak_rss_mb"]
+
+    def finish(self):
+        self.total_s = time.perf_counter() - self._t0
+        self.peak_rss_mb = peak_rss_mb()
+
+    def stages(self) -> dict:
+        """Total, quantidade e maior duração de cada etapa."""
+        stages = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stage = stages.setdefault(span["name"], {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            stage["count"] += 1
+            stage["total_s"] += span["duration_s"]
+            stage["max_s"] = max(stage["max_s"], span["duration_s"])
+        return stages
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_s": self.total_s,
+            "peak_rss_mb": self.peak_rss_mb,
+            "peak_rss_start_mb": self.peak_rss_start_mb,
+            "children_peak_rss_mb": dict(self.children_peak_rss_mb),
+            "counters": counters,
+            "stages": self.stages(),
+            "spans": spans,
+        }
+
+    def save(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        slug = "".join(c if c.isalnum() else "_" for c in self.name.lower())
+        path = os.path.join(
+            directory, f"trace_{slug}_{self.started_at:%Y%m%d_%H%M%S}.json"
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def summary_text(self, top: int = 4) -> str:
+        """Ex.: "4.2s · http_get 2.9s · goto 0.8s · 1.3 MB baixados · pico 182 MB"."""
+        parts = [f"{self.total_s or 0:.1f}s"]
+        stages = sorted(self.stages().items(), key=lambda item: -item[1]["total_s"])
+        parts += [f"{name} {stage['total_s']:.1f}s" for name, stage in stages[:top]]
+
+        baixados = self.counters.get("http_bytes", 0) + self.counters.get("browser_bytes", 0)
+        parts.append(f"{baixados / (1024 * 1024):.1f} MB baixados")
+        if self.counters.get("retries"):
+            parts.append(f"{self.counters['retries']} novas tentativas")
+        if self.peak_rss_mb is not None:
+            parts.append(f"pico {self.peak_rss_mb:.0f} MB")
+        return " · ".join(parts)
+
+
+def span(name: str, url: str | None = None):
+    """Mede o bloco no trace atual; sem trace ativo, não faz nada."""
+    tracer = current_trace.get()
+    return tracer.span(name, url) if tracer is not None else nullcontext()
+
+
+def record(name: str, start: float, duration: float, url: str | None = None):
+    tracer = current_trace.get()
+    if tracer is not None:
+        tracer.record(name, start, duration, url)
+
+
+def count(name: str, value: int = 1):
+    tracer = current_trace.get()
+    if tracer is not None:
+        tracer.count(name, value)
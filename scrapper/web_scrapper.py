@@ -1,198 +1,835 @@
-from playwright.sync_api import sync_playwright
-import locale
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
 from bs4 import BeautifulSoup
-from data_handling import process_data
+from scrapper.browser_pool import BrowserPool
+from scrapper.data_handling import WEEK_LABEL_RE, parse_week_range, process_data, week_key
+from scrapper.headings import extract_headings, page_headings
+from scrapper.http_cache import HttpCache
+from scrapper.http_fetcher import HttpFetcher
+from scrapper.jobs import JobCancelled, check_cancelled, propagate_context
+from scrapper.rate_control import CircuitOpen, FetchScheduler
+from scrapper.readiness import PageReadiness, ReadyStage
+from scrapper.request_blocking import ResourceBlocker, ResourceSizes
+from scrapper.streaming import JsonArrayWriter, iter_from_thread
+from scrapper.week_calendar import WeekIndex, month_index_url, monday_of, week_label
+from scrapper import week_calendar, tracing
 import json
 import os
-
-
-class DataScrapper:
-    def __init__(self):
-        try:
-            locale.setlocale(locale.LC_ALL, "es_MX.UTF-8")
-        except:
-            locale.setlocale(locale.LC_ALL, "es-MX")
-
+import time
+import weakref
+
+
+# Cards das semanas na página de um mês e cards dos meses na página do ano
+MONTH_CARDS = "#materialNav nav ul li a.cardContainer"
+YEAR_CARDS = "ul.directory.navCard li.row.card a.cardContainer"
+TODAY_CARDS = "ul.directory.navCard li.todayItem a.cardContainer"
+
+HOME_URL = "https://wol.jw.org/es/wol/h/r4/lp-s"
+
+# Lugar de uma semana que desistiu no buffer de `_iter_weeks`
+_SKIPPED = object()
+
+# O que cada etapa do navegador precisa na página para ser lida
+READY_STAGES = {
+    "home": ReadyStage("home", "#menuToday", timeout=20),
+    "today": ReadyStage("today", TODAY_CARDS, timeout=15, baseline="networkidle"),
+    "year_index": ReadyStage("year_index", YEAR_CARDS, timeout=15),
+    "month_index": ReadyStage("month_index", MONTH_CARDS, timeout=15),
+    "week": ReadyStage("week", "#article h2", timeout=20),
+}
+
+# Texto e href de todos os cards em uma única ida ao navegador
+CARDS_JS = "cards => cards.map(a => [a.innerText, a.getAttribute('href')])"
+
+# Tempo de vida no cache: índices mudam quando sai material novo, semanas
+# ainda não encerradas podem ser corrigidas, semanas passadas nunca mudam
+INDEX_CACHE_TTL = 60 * 60
+WEEK_CACHE_TTL = 6 * 60 * 60
+
+
+class ScrapperBase:
+    """Parte comum do DataScrapper e do AsyncDataScrapper.
+
+    Guarda a configuração, o cache HTTP, o índice de semanas e os relatórios,
+    e escolhe quais semanas baixar a partir dos cards. Nada aqui acessa a
+    rede; cada subclasse faz isso com a sua API (síncrona ou asyncio).
+    """
+
+    # Classe que espera as páginas ficarem prontas no navegador
+    readiness_class = PageReadiness
+    # Classe que limita, repete e pausa as requisições ao site
+    scheduler_class = FetchScheduler
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        navigation_timeout: float = 30,
+        headless: bool = True,
+        block_resources: bool = True,
+        use_http: bool = True,
+        measure_readiness: bool = False,
+        max_concurrency: int | None = None,
+    ):
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.json_dir = os.path.join(self.base_dir, "json_data")
 
+        # Quantas páginas de semana podem estar carregando ao mesmo tempo: o
+        # limite começa em `concurrency` e o scheduler sobe até `max_concurrency`
+        # enquanto o site responde bem, e desce em timeouts, 5xx e 429
+        self.concurrency = max(1, concurrency)
+        self.max_concurrency = max(self.concurrency, max_concurrency or 4 * self.concurrency)
+        self.scheduler = self.scheduler_class(self.concurrency, self.max_concurrency)
+        # (url, erro) das semanas que falharam mesmo depois das novas tentativas
+        self.last_failed = []
+        self.navigation_timeout = navigation_timeout
+        # Cada página é lida assim que tem o que a etapa precisa, sem esperar
+        # load/networkidle; measure_readiness=True mede quanto isso economiza
+        self.readiness = self.readiness_class(navigation_timeout, measure=measure_readiness)
+
+        # Perfil de scraping: sem janela e sem imagens, fontes, CSS, mídia e analytics.
+        # headless=False, block_resources=False reproduz o navegador visível de antes
+        self.headless = headless
+        self.block_resources = block_resources
+        self._blockers = weakref.WeakKeyDictionary()
+        self.last_resource_report = []
+        self.last_readiness_report = []
+        self.last_skipped = 0
+
+        # Páginas de semana vêm renderizadas do servidor: HTTP primeiro, navegador
+        # só quando o HTML não traz um programa válido
+        self.use_http = use_http
+        self._cache_ttls = {}
+        self.cache = HttpCache(os.path.join(self.base_dir, "cache"))
+
         os.makedirs(self.json_dir, exist_ok=True)
 
-    def open_browser(self):
-        self.playwright = sync_playwright().start()
+        # Semana ISO -> página da semana, aprendido dos índices já lidos
+        self.week_index = WeekIndex(os.path.join(self.json_dir, "week_index.json"))
+        # Tamanho dos recursos bloqueáveis, aprendido nas rodadas sem bloqueio
+        self.resource_sizes = ResourceSizes(
+            os.path.join(self.json_dir, "resource_sizes.json")
+        )
+
+    def _launch_options(self) -> tuple[dict, dict]:
+        """Opções do navegador e do contexto para o perfil escolhido."""
+        if self.headless:
+            return {"headless": True}, {}
+        return (
+            {"headless": False, "args": ["--start-maximized"]},
+            {"no_viewport": True},
+        )
 
-        try:
-            self.browser = self.playwright.chromium.launch(
-                headless=False, args=["--start-maximized"]
-            )
-        except:
-            try:
-                self.browser = self.playwright.firefox.launch(
-                    headless=False, args=["--start-maximized"]
-                )
-            except Exception as e:
-                raise e
+    @staticmethod
+    def get_week_extremes() -> str:
+        return week_label(date.today())
+
+    @staticmethod
+    def _week_end_date(text: str, reference: date | None = None):
+        """Domingo da semana descrita no texto de um card, ou None."""
+        week_range = parse_week_range(text, reference)
+        return week_range[1] if week_range else None
 
-        self.context = self.browser.new_context(no_viewport=True)
-        return self.context.new_page()
+    def _cache_ttl(self, url: str):
+        return self._cache_ttls.get(url, INDEX_CACHE_TTL)
 
     @staticmethod
-    def get_week_extremes() -> str:
-        target_date = datetime.now().date()
+    def extract_headings(html: str) -> list[str]:
+        return extract_headings(html)
 
-        monday = target_date - timedelta(days=target_date.weekday())
-        sunday = monday + timedelta(days=6)
+    @staticmethod
+    def year_index_url(year: int) -> str:
+        return week_calendar.year_index_url(year)
 
-        meses = {
-            1: "ENERO", 2: "FEBRERO", 3: "MARZO", 4: "ABRIL",
-            5: "MAYO", 6: "JUNIO", 7: "JULIO", 8: "AGOSTO",
-            9: "SEPTIEMBRE", 10: "OCTUBRE", 11: "NOVIEMBRE", 12: "DICIEMBRE",
-        }
+    @staticmethod
+    def _absolute_url(href: str) -> str:
+        return f"https://wol.jw.org{href}" if href.startswith("/") else href
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.split()).lower()
+
+    @classmethod
+    def _week_label(cls, text: str) -> str | None:
+        match = WEEK_LABEL_RE.search(cls._normalize(text))
+        return match.group(0) if match else None
+
+    @classmethod
+    def _card_key(cls, text: str, reference: date) -> str:
+        """Chave da semana de um card, a mesma de `Week.key` no histórico."""
+        week_range = parse_week_range(text, reference)
+        return week_key(cls._week_label(text) or text, week_range[0] if week_range else None)
+
+    @classmethod
+    def _is_current_week(cls, text: str, current_monday: date, current_week_text: str) -> bool:
+        # Compara datas, não o texto: o card pode vir com outra caixa ou
+        # espaçamento; o texto fica só para cards que não dão para interpretar
+        week_range = parse_week_range(text, current_monday)
+        if week_range is not None:
+            return week_range[0] == current_monday
+        return current_week_text in cls._normalize(text)
+
+    def _links_from_current_week(self, cards, known_weeks=None) -> list[str]:
+        """Links dos cards a partir do card da semana atual (inclusive).
+
+        Semanas cuja chave (`Week.key`: a segunda-feira, em ISO) está em
+        `known_weeks` já estão no histórico e são puladas; a semana atual é
+        sempre baixada de novo. O total pulado fica em `self.last_skipped`.
+        """
+        current_monday = monday_of(date.today())
+        current_week_text = week_label(current_monday)
+        known = set(known_weeks or ())
+        valid_links = []
+        found_current_week = False
+        skipped = 0
+
+        for text, href in cards:
+            is_current = self._is_current_week(text, current_monday, current_week_text)
+            if not found_current_week and is_current:
+                found_current_week = True
+
+            if found_current_week:
+                if not is_current and self._card_key(text, current_monday) in known:
+                    skipped += 1
+                    continue
+
+                valid_links.append(self._absolute_url(href))
+
+        self.last_skipped = skipped
+        if skipped:
+            print(f"{skipped} semanas já salvas no histórico foram puladas")
+
+        return valid_links
+
+    def _take_resources(self, page, url) -> dict:
+        blocker = self._blockers.get(page.context)
+        stats = blocker.take(page) if blocker else {}
+        if url is not None:
+            tracing.count("browser_bytes", stats.get("bytes_received", 0))
+            if stats.get("bytes_saved") is not None:
+                tracing.count("browser_bytes_saved", stats["bytes_saved"])
+        return {"url": url, **stats}
+
+    def _report_resources(self, report):
+        """Guarda e mostra quantas requisições e bytes cada semana economizou."""
+        self.last_resource_report = [r for r in report if r is not None]
+
+        for r in self.last_resource_report:
+            if "requests_blocked" not in r:
+                continue
+            if r["bytes_saved"] is None:
+                economia = "economia desconhecida"
+            elif r["blocked_unsized"]:
+                economia = f"ao menos ~{r['bytes_saved'] / 1024:.0f} KB economizados"
+            else:
+                economia = f"~{r['bytes_saved'] / 1024:.0f} KB economizados"
+            print(
+                f"{r['url']}: {r['requests_blocked']} requisições bloqueadas, "
+                f"{economia}, {r['bytes_received'] / 1024:.0f} KB baixados"
+            )
+
+        self.resource_sizes.save()
+
+    def _report_readiness(self):
+        """Guarda e mostra quanto cada página esperou até ficar pronta."""
+        self.last_readiness_report = self.readiness.take_report()
+        self.readiness.print_report(self.last_readiness_report)
 
-        if monday.month == sunday.month:
-            return f"{monday.day}-{sunday.day} DE {meses[monday.month]}".lower()
-        else:
-            return (
-                f"{monday.day} DE {meses[monday.month]} "
-                f"A {sunday.day} DE {meses[sunday.month]}"
-            ).lower()
 
     @staticmethod
-    def scrape_data(page) -> list[str]:
-        html = page.content()
+    def _parse_cards(html: str, selector: str) -> list[tuple[str, str]]:
         soup = BeautifulSoup(html, "html.parser")
+        return [
+            (a.get_text(" "), a.get("href"))
+            for a in soup.select(selector)
+            if a.get("href")
+        ]
+
+    def _remember_cards(self, cards, reference: date):
+        """Anota o que os cards de um índice dizem sobre as semanas.
+
+        Cards de semana definem por quanto tempo a página dela vale no cache
+        e entram em `self.week_index`.
+        """
+        for text, href in cards:
+            end = self._week_end_date(text, reference)
+            if end is not None:
+                ended = end < date.today()
+                self._cache_ttls[self._absolute_url(href)] = (
+                    None if ended else WEEK_CACHE_TTL
+                )
 
-        return [h.text.strip() for h in soup.find_all(["h1", "h2", "h3"])]
+        self.week_index.add_cards(
+            [(text, self._absolute_url(href)) for text, href in cards], reference
+        )
+
+    def _report_failed(self, failed):
+        """Guarda e mostra as semanas que ficaram de fora da última extração."""
+        self.last_failed = [(url, str(error)) for url, error in failed]
+        for url, error in self.last_failed:
+            print(f"Semana não baixada: {url} ({error})")
+
+    def _write_json(self, filename: str, programs: list[dict]):
+        path = os.path.join(self.json_dir, filename)
+        with tracing.span("json_write"), open(path, "w", encoding="utf-8") as f:
+            json.dump(programs, f, indent=4, ensure_ascii=False)
+
+
+class DataScrapper(ScrapperBase):
+    def __init__(
+        self,
+        concurrency: int = 4,
+        navigation_timeout: float = 30,
+        pool_size: int = 2,
+        headless: bool = True,
+        block_resources: bool = True,
+        use_http: bool = True,
+        measure_readiness: bool = False,
+        max_concurrency: int | None = None,
+    ):
+        super().__init__(
+            concurrency, navigation_timeout, headless, block_resources,
+            use_http, measure_readiness, max_concurrency,
+        )
+        self.http = HttpFetcher(
+            max_connections=self.max_concurrency,
+            cache=self.cache,
+            ttl_policy=self._cache_ttl,
+        )
+
+        # Navegadores ficam abertos entre as extrações e são reaproveitados
+        self.pool = BrowserPool(self.launch_browser, size=pool_size)
+
+    def launch_browser(self, playwright):
+        """Abre o navegador e o contexto usados por uma sessão do pool."""
+        launch_options, context_options = self._launch_options()
+
+        with tracing.span("browser_launch"):
+            try:
+                browser = playwright.chromium.launch(**launch_options)
+            except:
+                try:
+                    browser = playwright.firefox.launch(**launch_options)
+                except Exception as e:
+                    raise e
 
-    def extract_this_month(self):
-        try:
-            page = self.open_browser()
-            data = []
+            context = browser.new_context(**context_options)
 
-            current_month = datetime.now().strftime("%B").lower()
-            current_year = datetime.now().year
-            current_week_text = self.get_week_extremes()
+        blocker = ResourceBlocker(block=self.block_resources, sizes=self.resource_sizes)
+        blocker.install(context)
+        self._blockers[context] = blocker
 
-            link = (
-                f"https://wol.jw.org/es/wol/library/r4/lp-s/"
-                f"biblioteca/guía-de-actividades/"
-                f"guía-de-actividades-{current_year}/{current_month}"
-            )
+        return browser, context
 
-            page.goto(link)
+    def close(self):
+        """Fecha os navegadores do pool. Chamado uma vez, ao sair do app."""
+        self.pool.close()
+        self.http.close()
+
+    @staticmethod
+    def scrape_data(page) -> list[str]:
+        return page_headings(page)
+
+    def _http_get(self, url: str) -> str:
+        """HTML de `url` pelo scheduler: espera vaga, respeita o disjuntor e tenta de novo."""
+        def get():
+            with tracing.span("http_get", url):
+                return self.http.get_html(url)
+
+        return self.scheduler.call(url, get)
+
+    def _discover_cards(self, url: str, selector: str, reference: date | None = None) -> list[tuple[str, str]]:
+        """Texto e href dos cards de uma página de índice.
+
+        Tenta primeiro o HTML cru; o navegador só é aberto se nenhum card
+        for encontrado. Os cards de semana entram em `self.week_index`;
+        `reference` é uma data do período da página, para acertar o ano
+        dos rótulos (hoje, por padrão).
+        """
+        check_cancelled()
+        reference = reference or date.today()
+        cards = None
+        if self.use_http:
+            try:
+                html = self._http_get(url)
+                with tracing.span("parse_cards", url):
+                    cards = self._parse_cards(html, selector)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                print(f"HTTP falhou para {url}, usando o navegador: {e}")
 
-            items = page.locator("#materialNav nav ul li a.cardContainer").all()
+        if not cards:
+            cards = self.pool.run(
+                lambda page: self.scheduler.call(
+                    url, lambda: self._browser_cards(page, url, selector)
+                )
+            )
+            self._report_readiness()
 
-            valid_links = []
-            found_current_week = False
+        self._remember_cards(cards, reference)
+        return cards
 
-            for item in items:
-                if current_week_text in item.inner_text().lower():
-                    found_current_week = True
+    @staticmethod
+    def _card_index(page, selector: str) -> list[tuple[str, str]]:
+        """Texto e href de todos os cards do seletor, lidos em um só evaluate."""
+        return [
+            (text, href)
+            for text, href in page.locator(selector).evaluate_all(CARDS_JS)
+            if href
+        ]
+
+    def _browser_cards(self, page, url: str, selector: str) -> list[tuple[str, str]]:
+        stage = next(
+            (s for s in READY_STAGES.values() if s.selector == selector),
+            ReadyStage("cards", selector, timeout=15),
+        )
+        self.readiness.goto(page, url, stage)
+
+        with tracing.span("read_cards", url):
+            return self._card_index(page, selector)
+
+    def _http_week(self, url: str) -> list[str] | None:
+        """Cabeçalhos da semana via HTTP, ou None se o resultado não for válido."""
+        check_cancelled()
+        try:
+            html = self._http_get(url)
+            with tracing.span("parse_headings", url):
+                data = self.extract_headings(html)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"HTTP falhou para {url}: {e}")
+            return None
+
+        # Sem programa reconhecível, a página precisa ser renderizada no navegador
+        return data if process_data(data) else None
+
+    def _iter_weeks(self, urls, on_failed=None):
+        """Gera (indice, cabeçalhos) de cada semana de `urls`, na ordem de `urls`.
+
+        As páginas são baixadas por HTTP em paralelo; as que falham na
+        validação são visitadas pelo navegador, em lotes. Uma semana pronta
+        antes das anteriores espera por elas em um buffer, e nenhuma página
+        é pedida a `self.max_concurrency` ou mais posições da primeira que
+        ainda não saiu: entre baixando, esperando o navegador e no buffer,
+        nunca passam dessa janela. Uma semana que não vem nem depois das
+        novas tentativas vai para `on_failed(indice, erro)` e a ordem segue
+        sem ela.
+        """
+        window = self.max_concurrency
+        executor = ThreadPoolExecutor(max_workers=window) if self.use_http else None
+        http_week = propagate_context(self._http_week)
+        # índice -> cabeçalhos, ou _SKIPPED para as que desistiram
+        prontas = {}
+        futures = {}
+        missing = []
+        proxima = 0
+        pedidas = 0
+        try:
+            while proxima < len(urls):
+                limite = min(len(urls), proxima + window)
+                for indice in range(pedidas, limite):
+                    if executor is not None:
+                        futures[executor.submit(http_week, urls[indice])] = indice
+                    else:
+                        missing.append(indice)
+                pedidas = max(pedidas, limite)
+
+                if futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        indice = futures.pop(future)
+                        check_cancelled()
+                        data = future.result()
+                        if data is None:
+                            missing.append(indice)
+                        else:
+                            prontas[indice] = data
+                elif missing:
+                    # Só o navegador falta para a próxima semana sair
+                    for kind, indice, value in self._iter_browser_weeks(urls, sorted(missing)):
+                        if kind == "ready":
+                            prontas[indice] = value
+                        else:
+                            prontas[indice] = _SKIPPED
+                            if on_failed is not None:
+                                on_failed(indice, value)
+                    missing = []
+
+                while proxima in prontas:
+                    data = prontas.pop(proxima)
+                    proxima += 1
+                    if data is not _SKIPPED:
+                        yield proxima - 1, data
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def _iter_browser_weeks(self, urls, indices):
+        """("ready", indice, cabeçalhos) ou ("failed", indice, erro) das semanas `indices`, pelo navegador."""
+        def produce(put):
+            delivered = set()
+
+            def deliver(kind, j, value):
+                delivered.add(j)
+                put((kind, indices[j], value))
 
-                if found_current_week:
-                    href = item.get_attribute("href")
-                    valid_links.append(
-                        f"https://wol.jw.org{href}" if href.startswith("/") else href
+            try:
+                self.pool.run(
+                    lambda page: self._browser_fetch_weeks(
+                        page,
+                        [urls[i] for i in indices],
+                        lambda j, data: deliver("ready", j, data),
+                        lambda j, error: deliver("failed", j, error),
                     )
+                )
+            except JobCancelled:
+                raise
+            except Exception as e:
+                # O navegador nem abriu (ou caiu): as semanas que faltavam ficam de fora
+                for j, indice in enumerate(indices):
+                    if j not in delivered:
+                        put(("failed", indice, e))
+
+        return iter_from_thread(produce, self.concurrency)
+
+    def _fetch_weeks(self, urls, on_ready=None, on_failed=None) -> list[list[str] | None]:
+        """Cabeçalhos de cada semana, na mesma ordem de `urls` (None nas que falharam).
+
+        Monta a lista toda; para muitas semanas, use `_iter_weeks`.
+        `on_ready(indice, cabeçalhos)` é chamado para cada semana, em ordem.
+        """
+        results = [None] * len(urls)
+        for indice, data in self._iter_weeks(urls, on_failed):
+            results[indice] = data
+            if on_ready is not None:
+                on_ready(indice, data)
+        return results
+
+    def _extract_weeks(
+        self, urls, on_week=None, on_progress=None, filename=None, collect=True
+    ) -> list[dict]:
+        """Baixa, processa e entrega as semanas de `urls` uma a uma.
+
+        Cada semana passa por `process_data`, vai para `on_week(programa)` e,
+        com `filename`, para o JSON em `json_dir` assim que é lida; nada
+        espera o fim da extração. Com `collect=False` os programas não são
+        guardados e a lista devolvida fica vazia: a memória não cresce com o
+        número de semanas. `on_progress(feitas, total)` acompanha quantas
+        páginas já chegaram (ou desistiram); as que falharam ficam em
+        `self.last_failed`. As semanas saem na ordem de `urls`, no JSON e em
+        `on_week` (ver `_iter_weeks`).
+        """
+        feitas = 0
+        failed = []
+        programs = []
+        if on_progress is not None:
+            on_progress(0, len(urls))
+
+        def week_failed(indice, error):
+            nonlocal feitas
+            feitas += 1
+            failed.append((urls[indice], error))
+            if on_progress is not None:
+                on_progress(feitas, len(urls))
+
+        writer = JsonArrayWriter(os.path.join(self.json_dir, filename)) if filename else None
+        try:
+            for indice, data in self._iter_weeks(urls, week_failed):
+                check_cancelled()
+                feitas += 1
+                with tracing.span("process_data", urls[indice]):
+                    week_programs = process_data(data)
+                for program in week_programs:
+                    if writer is not None:
+                        with tracing.span("json_write"):
+                            writer.write(program)
+                    if on_week is not None:
+                        on_week(program)
+                    if collect:
+                        programs.append(program)
+                if on_progress is not None:
+                    on_progress(feitas, len(urls))
+        except BaseException:
+            if writer is not None:
+                writer.discard()
+            raise
+
+        if writer is not None:
+            writer.close()
+        self._report_failed(failed)
+        return programs
+
+    def _browser_week(self, page, url: str) -> list[str]:
+        self.readiness.goto(page, url, READY_STAGES["week"])
+        with tracing.span("read_headings", url):
+            return self.scrape_data(page)
+
+    def _browser_fetch_weeks(self, page, urls, on_ready=None, on_failed=None) -> list[list[str] | None]:
+        """Visita as páginas das semanas usando várias abas do mesmo contexto.
+
+        Até `self.concurrency` abas; quantas navegam ao mesmo tempo é o
+        limite do scheduler. Uma aba que passa do prazo libera a vaga e a
+        semana volta para a fila depois da espera da RetryPolicy; com o
+        disjuntor do host aberto, ela espera a pausa na fila. Os
+        resultados voltam na mesma ordem de `urls`; com `on_ready(indice,
+        cabeçalhos)`, cada página lida vai só para ele e não fica na lista.
+        `on_failed(indice, erro)` recebe as que desistiram.
+        """
+        report = [None] * len(urls)
+        results = [None] * len(urls)
+        # Descarta o que foi contado nas páginas de índice
+        self._take_resources(page, None)
+
+        def entregar(indice, data):
+            if on_ready is None:
+                results[indice] = data
+            else:
+                on_ready(indice, data)
+
+        def desistir(indice, error):
+            if on_failed is not None:
+                on_failed(indice, error)
+
+        if self.concurrency == 1 or len(urls) <= 1:
+            for indice, url in enumerate(urls):
+                try:
+                    data = self.scheduler.call(url, lambda: self._browser_week(page, url))
+                except JobCancelled:
+                    raise
+                except Exception as e:
+                    desistir(indice, e)
+                    continue
+                report[indice] = self._take_resources(page, url)
+                entregar(indice, data)
+
+            self._report_resources(report)
+            self._report_readiness()
+            return results
+
+        abas = [page] + [
+            page.context.new_page()
+            for _ in range(min(self.concurrency, len(urls)) - 1)
+        ]
+        livres = list(abas)
+        stage = READY_STAGES["week"]
+        limiter = self.scheduler.limiter
+        # (índice, tentativa, a partir de quando pode navegar)
+        pendentes = [(indice, 0, 0.0) for indice in range(len(urls))]
+        # índice -> `openings` da primeira vez que o disjuntor recusou a semana
+        bloqueadas = {}
+        em_andamento = {}
+        # Início de cada navegação, para o span "goto" das abas
+        navegacoes = {}
+
+        def falhou(indice, tentativa, error):
+            delay = self.scheduler.failed(urls[indice], error, tentativa)
+            if delay is None:
+                desistir(indice, error)
+            else:
+                pendentes.append((indice, tentativa + 1, time.monotonic() + delay))
+
+        def iniciar():
+            """Põe abas livres para navegar, enquanto o scheduler tiver vaga."""
+            agora = time.monotonic()
+            for item in [p for p in pendentes if p[2] <= agora]:
+                if not livres or not limiter.try_acquire():
+                    return
+                pendentes.remove(item)
+                indice, tentativa, _ = item
+                url = urls[indice]
+                try:
+                    self.scheduler.breaker(url).before_call()
+                except CircuitOpen as e:
+                    limiter.release()
+                    primeira = bloqueadas.setdefault(indice, e.openings)
+                    delay = self.scheduler.circuit_wait(e, tentativa, primeira)
+                    if delay is None:
+                        desistir(indice, e)
+                    else:
+                        pendentes.append((indice, tentativa, agora + delay))
+                    continue
+                bloqueadas.pop(indice, None)
+
+                aba = livres.pop()
+                navegacoes[aba] = time.perf_counter()
+                try:
+                    em_andamento[aba] = (indice, tentativa, self.readiness.navigate(aba, url, stage))
+                except Exception as e:
+                    limiter.release()
+                    livres.append(aba)
+                    falhou(indice, tentativa, e)
 
-            for url in valid_links:
-                page.goto(url)
-                data.append(self.scrape_data(page))
-
-            path = os.path.join(self.json_dir, "programa_do_mes_atual.json")
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(process_data(data), f, indent=4, ensure_ascii=False)
+        try:
+            iniciar()
+            while em_andamento or pendentes:
+                # Dá tempo para as abas carregarem entre uma verificação e outra
+                page.wait_for_timeout(25)
+                # Cancelamento ou timeout do job fecham as abas no meio da navegação
+                check_cancelled()
+
+                for aba in list(em_andamento):
+                    indice, tentativa, prazo = em_andamento[aba]
+                    url = urls[indice]
+
+                    if self.readiness.is_ready(aba, stage):
+                        del em_andamento[aba]
+                        limiter.release()
+                        inicio = navegacoes.pop(aba)
+                        tracing.record("goto", inicio, time.perf_counter() - inicio, url)
+                        self.readiness.ready(aba, stage, url, inicio)
+                        with tracing.span("read_headings", url):
+                            data = self.scrape_data(aba)
+                        self.scheduler.succeeded(url)
+                        report[indice] = self._take_resources(aba, url)
+                        livres.append(aba)
+                        entregar(indice, data)
+                    elif time.monotonic() > prazo:
+                        del em_andamento[aba]
+                        limiter.release()
+                        navegacoes.pop(aba)
+                        livres.append(aba)
+                        falhou(indice, tentativa, TimeoutError(f"Tempo esgotado ao carregar {url}"))
+
+                iniciar()
+        finally:
+            for _ in em_andamento:
+                limiter.release()
+            for aba in abas[1:]:
+                self._take_resources(aba, None)
+                aba.close()
+
+        self._report_resources(report)
+        self._report_readiness()
+        return results
+
+    def extract_this_month(self, known_weeks=None, on_week=None, on_progress=None, collect=True) -> list[dict]:
+        try:
+            return self._extract_weeks(
+                self._this_month_links(known_weeks), on_week, on_progress,
+                "programa_do_mes_atual.json", collect,
+            )
 
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Erro em extract_this_month: {e}")
+            return []
 
-    def extract_this_week(self) -> list[str]:
-        try:
-            page = self.open_browser()
-            page.goto("https://wol.jw.org/es/wol/h/r4/lp-s")
-
-            page.click("#menuToday")
-            page.wait_for_load_state("networkidle")
+    def _this_month_links(self, known_weeks=None) -> list[str]:
+        today = date.today()
+        link = month_index_url(today.year, today.month)
 
-            current_week = self.get_week_extremes()
-            links = page.locator("ul.directory.navCard li.todayItem a.cardContainer")
+        cards = self._discover_cards(link, MONTH_CARDS)
+        return self._links_from_current_week(cards, known_weeks)
 
-            for i in range(links.count()):
-                link = links.nth(i)
-                if current_week in link.inner_text().lower():
-                    link.click()
-                    break
+    def extract_this_week(self, on_week=None, on_progress=None, collect=True) -> list[dict]:
+        try:
+            data = None
+            if on_progress is not None:
+                on_progress(0, 1)
+
+            # Caminho rápido: a página da semana direto pelo índice de semanas
+            # e, se ela ainda não estiver lá, pelo card no índice do mês
+            if self.use_http:
+                url = self.week_index.get(date.today())
+                if url is not None:
+                    data = self._http_week(url)
+                if data is None:
+                    links = self._this_month_links()
+                    if links:
+                        data = self._http_week(links[0])
+
+            if data is None:
+                data = self.pool.run(
+                    lambda page: self.scheduler.call(
+                        HOME_URL, lambda: self._extract_this_week(page)
+                    )
+                )
+                self._report_readiness()
 
-            data = self.scrape_data(page)
+            with tracing.span("process_data"):
+                programs = process_data(data)
+            if on_week is not None:
+                for program in programs:
+                    on_week(program)
+            if on_progress is not None:
+                on_progress(1, 1)
 
-            path = os.path.join(self.json_dir, "programa_da_semana.json")
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(process_data(data), f, indent=4, ensure_ascii=False)
+            self._write_json("programa_da_semana.json", programs)
 
-            return data
+            return programs if collect else []
 
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Erro em extract_this_week: {e}")
             return []
 
-    def extract_all_available_weeks(self):
-        try:
-            page = self.open_browser()
-            current_year = datetime.now().year
+    def _extract_this_week(self, page) -> list[str]:
+        self.readiness.goto(page, HOME_URL, READY_STAGES["home"])
+        check_cancelled()
 
-            link = (
-                f"https://wol.jw.org/es/wol/library/r4/lp-s/"
-                f"biblioteca/guía-de-actividades/guía-de-actividades-{current_year}"
-            )
+        page.click("#menuToday")
+        self.readiness.wait(page, READY_STAGES["today"])
+        check_cancelled()
 
-            page.goto(link)
-            page.wait_for_selector("ul.directory.navCard li.row.card a.cardContainer")
+        current_week = self.get_week_extremes()
+        week_stage = READY_STAGES["week"]
+        self.readiness.forget(page, week_stage)
 
-            urls = []
-            for locator in page.locator(
-                "ul.directory.navCard li.row.card a.cardContainer"
-            ).all():
-                href = locator.get_attribute("href")
-                urls.append(f"https://wol.jw.org{href}")
+        for i, (text, _) in enumerate(page.locator(TODAY_CARDS).evaluate_all(CARDS_JS)):
+            if current_week in self._normalize(text):
+                page.locator(TODAY_CARDS).nth(i).click()
+                self.readiness.wait(page, week_stage)
+                break
 
-            data = self.__extract_everything_from_now(page, urls)
+        with tracing.span("read_headings"):
+            return self.scrape_data(page)
 
-            path = os.path.join(
-                self.json_dir, "programa_de_todas_as_semanas_disponiveis.json"
-            )
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(process_data(data), f, indent=4, ensure_ascii=False)
+    def extract_all_available_weeks(self, known_weeks=None, on_week=None, on_progress=None, collect=True) -> list[dict]:
+        """Todas as semanas do ano a partir da atual.
 
-        except Exception as e:
-            print(f"Erro em extract_all_available_weeks: {e}")
+        As semanas vão para `on_week` e para o JSON à medida que chegam; com
+        `collect=False` (quem já guarda cada semana em `on_week`) a lista
+        devolvida fica vazia e a memória não cresce com o número de semanas.
+        """
+        try:
+            link = self.year_index_url(date.today().year)
 
-    def __extract_everything_from_now(self, page, urls):
-        data = []
-        valid_links = []
-        current_week_text = self.get_week_extremes()
-        found_current_week = False
+            cards = self._discover_cards(link, YEAR_CARDS)
+            urls = [self._absolute_url(href) for _, href in cards]
 
-        for url in urls:
-            page.goto(url)
-            items = page.locator("#materialNav nav ul li a.cardContainer").all()
+            return self.__extract_everything_from_now(
+                urls, known_weeks, on_week, on_progress, collect
+            )
 
-            for item in items:
-                if not found_current_week and current_week_text in item.inner_text().lower():
-                    found_current_week = True
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"Erro em extract_all_available_weeks: {e}")
+            return []
 
-                if found_current_week:
-                    href = item.get_attribute("href")
-                    valid_links.append(
-                        f"https://wol.jw.org{href}" if href.startswith("/") else href
-                    )
+    def __extract_everything_from_now(self, urls, known_weeks=None, on_week=None, on_progress=None, collect=True):
+        # Os índices dos meses são lidos em paralelo, na ordem dos meses
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            month_cards = executor.map(propagate_context(self._month_cards), urls)
+            cards = [card for month in month_cards for card in month]
 
-        for url in valid_links:
-            page.goto(url)
-            data.append(self.scrape_data(page))
+        return self._extract_weeks(
+            self._links_from_current_week(cards, known_weeks), on_week, on_progress,
+            "programa_de_todas_as_semanas_disponiveis.json", collect,
+        )
 
-        return data
+    def _month_cards(self, url: str) -> list[tuple[str, str]]:
+        """Cards de semana de um mês; um mês que não abre não derruba os outros."""
+        try:
+            return self._discover_cards(url, MONTH_CARDS)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"Índice do mês não lido: {url} ({e})")
+            return []
 
 # Exemplo de uso
 # main = DataScrapper()
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from scrapper.data_handling import MESES, parse_week_range
+import json
+import os
+import threading
+
+
+# Nomes dos meses usados nas URLs da Guía de actividades ("marzo"), sem
+# depender do locale do processo
+MONTH_SLUGS = {numero: nome.lower() for numero, nome in MESES.items()}
+
+WOL_LIBRARY = "https://wol.jw.org/es/wol/library/r4/lp-s/biblioteca/guía-de-actividades"
+
+
+def monday_of(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def week_label(day: date) -> str:
+    """Rótulo da semana de `day`, como no site: "3-9 de marzo" ou "28 de abril a 4 de mayo"."""
+    monday = monday_of(day)
+    sunday = monday + timedelta(days=6)
+
+    if monday.month == sunday.month:
+        return f"{monday.day}-{sunday.day} de {MONTH_SLUGS[monday.month]}"
+    return (
+        f"{monday.day} de {MONTH_SLUGS[monday.month]} "
+        f"a {sunday.day} de {MONTH_SLUGS[sunday.month]}"
+    )
+
+
+def iso_week(day: date) -> str:
+    """Chave ISO da semana de `day`, como "2025-W10"."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def year_index_url(year: int) -> str:
+    return f"{WOL_LIBRARY}/guía-de-actividades-{year}"
+
+
+def month_index_url(year: int, month: int) -> str:
+    return f"{year_index_url(year)}/{MONTH_SLUGS[month]}"
+
+
+class WeekIndex:
+    """Semana ISO -> URL da página da semana, guardado em JSON.
+
+    É preenchido com os cards de semana de toda página de índice lida; com a
+    semana já no índice, a página dela é baixada direto, sem passar pelos
+    índices do ano e do mês. Pode ser usado por várias threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._weeks = json.load(f)
+        except (OSError, ValueError):
+            self._weeks = {}
+
+    def get(self, day: date) -> str | None:
+        with self._lock:
+            return self._weeks.get(iso_week(day))
+
+    def add_cards(self, cards, reference: date | None = None) -> int:
+        """Registra os cards (texto, URL) que descrevem uma semana; devolve quantos eram novos."""
+        novos = 0
+        with self._lock:
+            for text, url in cards:
+                week_range = parse_week_range(text, reference)
+                if week_range is None:
+                    continue
+                key = iso_week(week_range[0])
+                if self._weeks.get(key) != url:
+                    self._weeks[key] = url
+                    novos += 1
+
+            if novos:
+                self._save()
+        return novos
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._weeks, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,325 @@
+from contextvars import copy_context
+from scrapper.jobs import Job, JobCancelled, current_job
+from scrapper import tracing
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+
+
+# Tipo de extração -> método do DataScrapper que roda no processo do scraper
+EXTRACTIONS = {
+    "week": "extract_this_week",
+    "month": "extract_this_month",
+    "all": "extract_all_available_weeks",
+}
+
+
+class WorkerError(Exception):
+    """A extração falhou no processo do scraper, ou o processo parou no meio dela."""
+
+
+def _serve(conn, options: dict):
+    """Loop do processo do scraper: recebe pedidos pelo pipe e devolve as semanas.
+
+    Mensagens recebidas: ("extract", id, tipo, kwargs), ("cancel", id) e
+    ("stop",). Enviadas: ("week", id, programa), ("progress", id, feitas,
+    total), ("done", id, trace), ("cancelled", id, motivo) e ("error", id,
+    motivo).
+    """
+    from scrapper.web_scrapper import DataScrapper
+
+    scrapper = DataScrapper(**options)
+    # O navegador abre logo, para a primeira extração não esperar por ele
+    threading.Thread(target=scrapper.pool.warm_up, daemon=True).start()
+
+    send_lock = threading.Lock()
+    jobs = {}
+
+    def send(*message):
+        with send_lock:
+            conn.send(message)
+
+    def run(job_id, job, kind, kwargs):
+        tracer = tracing.Tracer(kind)
+        job_token = current_job.set(job)
+        trace_token = tracing.current_trace.set(tracer)
+        try:
+            # As semanas vão pelo pipe uma a uma; este processo não guarda a lista
+            getattr(scrapper, EXTRACTIONS[kind])(
+                on_week=lambda program: send("week", job_id, program),
+                on_progress=lambda feitas, total: send("progress", job_id, feitas, total),
+                collect=False,
+                **kwargs,
+            )
+            tracer.finish()
+            send("done", job_id, tracer.to_dict())
+        except JobCancelled as e:
+            send("cancelled", job_id, str(e))
+        except Exception as e:
+            send("error", job_id, f"{type(e).__name__}: {e}")
+        finally:
+            tracing.current_trace.reset(trace_token)
+            current_job.reset(job_token)
+            jobs.pop(job_id, None)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            # O app fechou o pipe (ou morreu): não há para quem responder
+            break
+
+        if message[0] == "extract":
+            _, job_id, kind, kwargs = message
+            job = jobs[job_id] = Job(kind, None)
+            threading.Thread(
+                target=run, args=(job_id, job, kind, kwargs), name=f"extract-{kind}", daemon=True
+            ).start()
+        elif message[0] == "cancel":
+            job = jobs.get(message[1])
+            if job is not None:
+                job.cancel()
+        elif message[0] == "stop":
+            break
+
+    for job in list(jobs.values()):
+        job.cancel()
+    scrapper.close()
+
+
+class ScraperWorker:
+    """Processo separado que mantém um DataScrapper com o navegador aberto.
+
+    Um navegador travado ou um Chromium que cai derrubam só esse processo:
+    as extrações em andamento recebem um WorkerError e o processo é aberto de
+    novo. Extrações canceladas que não param em `cancel_grace` segundos (uma
+    página travada, por exemplo) também derrubam o processo. A extração roda
+    em outro núcleo, sem disputar o processo da interface.
+
+    `handler(tipo, *dados)` recebe as mensagens de cada extração, na thread
+    que lê o pipe.
+    """
+
+    def __init__(self, options: dict | None = None, cancel_grace: float = 10):
+        self.options = options or {}
+        self.cancel_grace = cancel_grace
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._ids = itertools.count(1)
+        # id -> (handler, processo que está com a extração)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._process = None
+        self._conn = None
+        self._last_start = 0.0
+        self._quick_deaths = 0
+        self._start()
+
+    def _start(self):
+        """Abre o processo do scraper. Chamado com `self._lock` ou antes de haver jobs."""
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_serve, args=(child_conn, self.options), name="scraper-worker", daemon=True
+        )
+        process.start()
+        child_conn.close()
+
+        self._process, self._conn = process, conn
+        self._last_start = time.monotonic()
+        threading.Thread(
+            target=self._read, args=(conn, process), name="scraper-worker-reader", daemon=True
+        ).start()
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _read(self, conn, process):
+        while True:
+            try:
+                kind, job_id, *data = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            with self._lock:
+                entry = self._jobs.get(job_id)
+                if kind in ("done", "cancelled", "error"):
+                    self._jobs.pop(job_id, None)
+            if entry is not None:
+                entry[0](kind, *data)
+
+        process.join(timeout=5)
+        with self._lock:
+            orfaos = [
+                (job_id, handler) for job_id, (handler, owner) in self._jobs.items()
+                if owner is process
+            ]
+            for job_id, _ in orfaos:
+                del self._jobs[job_id]
+
+            # Reabre na hora; se ele cai logo ao subir várias vezes seguidas,
+            # só reabre no próximo pedido
+            if time.monotonic() - self._last_start < 5:
+                self._quick_deaths += 1
+            else:
+                self._quick_deaths = 0
+            restart = (
+                not self._closed
+                and self._process is process
+                and self._quick_deaths < 3
+            )
+            if restart:
+                self.restarts += 1
+                self._start()
+
+        for _, handler in orfaos:
+            handler("error", f"o processo do scraper parou (código {process.exitcode})")
+        if orfaos or restart:
+            print(f"Processo do scraper parou (código {process.exitcode}); reaberto: {restart}")
+
+    def submit(self, kind: str, handler, **kwargs) -> int:
+        """Pede uma extração (`kind` em EXTRACTIONS) e devolve o id dela."""
+        with self._lock:
+            if self._closed:
+                raise WorkerError("O processo do scraper já foi fechado")
+            if not self.alive:
+                self.restarts += 1
+                self._start()
+
+            job_id = next(self._ids)
+            self._jobs[job_id] = (handler, self._process)
+            try:
+                self._conn.send(("extract", job_id, kind, kwargs))
+            except (OSError, ValueError) as e:
+                del self._jobs[job_id]
+                raise WorkerError(f"Não foi possível falar com o processo do scraper: {e}")
+        return job_id
+
+    def cancel(self, job_id: int):
+        """Pede para a extração parar; se ela não parar a tempo, o processo é derrubado."""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return
+            try:
+                self._conn.send(("cancel", job_id))
+            except (OSError, ValueError):
+                pass
+
+        timer = threading.Timer(self.cancel_grace, self._kill_if_stuck, (job_id, entry[1]))
+        timer.daemon = True
+        timer.start()
+
+    def _kill_if_stuck(self, job_id: int, process):
+        with self._lock:
+            stuck = job_id in self._jobs and process.is_alive()
+        if stuck:
+            print(f"Extração {job_id} não parou em {self.cancel_grace:.0f}s; reiniciando o scraper")
+            process.kill()
+
+    def close(self, timeout: float = 10):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            process = self._process
+            try:
+                self._conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+
+        process.join(timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        self._conn.close()
+
+
+class WorkerScrapper:
+    """Mesma interface do AsyncDataScrapper, com a extração feita no ScraperWorker.
+
+    As semanas chegam pelo pipe e são entregues a `on_week`/`on_progress` no
+    loop de eventos de quem chamou. Cancelar a corrotina cancela a extração
+    no processo do scraper; os spans dele entram no trace atual.
+    """
+
+    def __init__(self, cancel_grace: float = 10, **options):
+        self.worker = ScraperWorker(options, cancel_grace=cancel_grace)
+
+    async def warm_up(self):
+        # O processo do scraper já abre o navegador assim que sobe
+        pass
+
+    async def close(self):
+        await asyncio.to_thread(self.worker.close)
+
+    async def extract_this_week(self, on_week=None, on_progress=None) -> list[dict]:
+        return await self._extract("week", {}, on_week, on_progress)
+
+    async def extract_this_month(self, known_weeks=None, on_week=None, on_progress=None) -> list[dict]:
+        return await self._extract(
+            "month", {"known_weeks": set(known_weeks or ())}, on_week, on_progress
+        )
+
+    async def extract_all_available_weeks(self, known_weeks=None, on_week=None, on_progress=None) -> list[dict]:
+        return await self._extract(
+            "all", {"known_weeks": set(known_weeks or ())}, on_week, on_progress
+        )
+
+    async def _extract(self, kind: str, kwargs: dict, on_week, on_progress) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+        programs = []
+        tracer = tracing.current_trace.get()
+        started = time.perf_counter()
+        # As mensagens são tratadas no contexto de quem chamou (trace, job)
+        context = copy_context()
+
+        def deliver(kind, data):
+            if finished.done():
+                return
+            if kind == "week":
+                programs.append(data[0])
+                if on_week is not None:
+                    on_week(data[0])
+            elif kind == "progress":
+                if on_progress is not None:
+                    on_progress(*data)
+            elif kind == "done":
+                if tracer is not None:
+                    tracer.merge(data[0], started, process="worker")
+                finished.set_result(programs)
+            elif kind == "cancelled":
+                finished.set_exception(JobCancelled(data[0]))
+            else:
+                finished.set_exception(WorkerError(data[0]))
+
+        def handler(kind, *data):
+            loop.call_soon_threadsafe(deliver, kind, data, context=context)
+
+        def cancel_submitted(task):
+            if not task.cancelled() and task.exception() is None:
+                self.worker.cancel(task.result())
+
+        submitting = asyncio.ensure_future(
+            asyncio.to_thread(self.worker.submit, kind, handler, **kwargs)
+        )
+        try:
+            job_id = await asyncio.shield(submitting)
+        except asyncio.CancelledError:
+            # O pedido pode já ter chegado ao processo: cancela assim que
+            # `submit` devolver o id
+            finished.cancel()
+            submitting.add_done_callback(cancel_submitted)
+            raise
+
+        try:
+            return await finished
+        except asyncio.CancelledError:
+            # Semanas e progresso que ainda vierem pelo pipe são descartados
+            finished.cancel()
+            self.worker.cancel(job_id)
+            raise